@@ -10,48 +10,102 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 from datetime import datetime, timedelta
 import json
-import sys
-import os
+import hashlib
 
-# Add src directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
-try:
-    from src.weather_query_processor import WeatherQueryProcessor
-    from src.meteomatics_client import MeteomaticsClient
-    from src.climatological_analyzer import ClimatologicalAnalyzer
-except ImportError:
-    # Fallback imports for when running directly
-    from weather_query_processor import WeatherQueryProcessor
-    from meteomatics_client import MeteomaticsClient
-    from climatological_analyzer import ClimatologicalAnalyzer
+from src.weather_query_processor import WeatherQueryProcessor, cached_process_query
+from src.meteomatics_client import MeteomaticsClient
+from src.climatological_analyzer import ClimatologicalAnalyzer, warmup_numba
 
 # Import configuration
 try:
-    from config import (APP_CONFIG, UI_CONFIG, get_meteomatics_credentials, 
-                       get_api_status, is_api_valid)
+    from config import (APP_CONFIG, UI_CONFIG, CACHE_CONFIG, get_meteomatics_credentials, 
+                       get_api_status, is_api_valid, configure_logging)
 except ImportError:
     # Fallback configuration
     APP_CONFIG = {'title': 'Climatological Probability Analysis', 'version': '1.0.0'}
     UI_CONFIG = {'page_config': {'page_title': 'Analysis', 'page_icon': '🌤️', 'layout': 'wide'}}
+    CACHE_CONFIG = {'enabled': True, 'ttl_seconds': 3600, 'max_size': 100}
     def get_meteomatics_credentials():
         return "demo", "demo"
     def get_api_status():
         return {"username": "demo", "valid_until": "N/A", "is_valid": False}
     def is_api_valid():
         return False
+    def configure_logging(level=None):
+        pass
 
 
-# Page configuration
-st.set_page_config(
-    page_title=APP_CONFIG.get('title', 'Climatological Analysis'),
-    page_icon=UI_CONFIG['page_config']['page_icon'],
-    layout=UI_CONFIG['page_config']['layout'],
-    initial_sidebar_state=UI_CONFIG['page_config']['initial_sidebar_state']
+@st.cache_data(ttl=3600)
+def _cached_api_status():
+    """API status, cached so sidebar reruns don't recompute it."""
+    return get_api_status()
+
+
+@st.cache_resource
+def _warmup_kernels():
+    """Compile the numba statistics kernels once per process."""
+    warmup_numba()
+
+
+@st.cache_resource
+def _get_processor(username="", password_digest="", _password=""):
+    """
+    Shared query processor, one per set of credentials across all sessions.
+    
+    The cache is keyed on the username and a digest of the password; the
+    password itself is passed unhashed so it never becomes part of a key.
+    """
+    # The long-running server amortizes worker start-up across queries
+    if username and _password:
+        return WeatherQueryProcessor(username, _password, use_process_pool=True)
+    return WeatherQueryProcessor(use_process_pool=True)
+
+
+def _password_digest(password):
+    """Digest standing in for a password in cache keys."""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def _processor_for(username, password):
+    """Cached processor for explicitly provided credentials."""
+    return _get_processor(username, _password_digest(password), password)
+
+
+@st.cache_data(ttl=86400, max_entries=512)
+def _location_suggestions(_processor, query):
+    """Location suggestions for a search query, cached per query string."""
+    return _processor.get_location_suggestions(query)
+
+
+# Line traces use go.Scattergl, which renders through WebGL in the browser.
+
+# Percentile bar colors keyed by the leading digit ('p90' -> 'p9')
+PERCENTILE_COLORS = {'p9': '#d62728', 'p8': '#ff7f0e', 'p7': '#ff7f0e', 'p5': '#2ca02c'}
+DEFAULT_PERCENTILE_COLOR = '#1f77b4'
+
+# Shared chart layouts, validated once; charts only set their variable parts
+PERCENTILE_LAYOUT = go.Layout(
+    title="Historical Percentile Distribution",
+    xaxis_title="Percentile",
+    showlegend=False,
+    height=400
+)
+RETURN_PERIOD_LAYOUT = go.Layout(
+    title="Return Period Analysis",
+    xaxis_title="Return Period (Years)",
+    xaxis_type="log",
+    height=400,
+    showlegend=False
+)
+TREND_LAYOUT = go.Layout(
+    xaxis_title="Year",
+    yaxis_title="Value",
+    height=400
 )
 
-# Custom CSS for better styling
-st.markdown("""
+
+# Static page content
+CUSTOM_CSS = """
     <style>
     .main-header {
         font-size: 3rem;
@@ -82,156 +136,81 @@ st.markdown("""
         padding: 1rem;
     }
     </style>
-""", unsafe_allow_html=True)
+"""
+
+MAIN_HEADER_HTML = '<h1 class="main-header">🌤️ {title}</h1>'.format(title=APP_CONFIG["title"])
+
+INTRO_MD = """
+**{description}**
+
+Version: {version}
+
+This tool provides comprehensive statistical analysis of weather conditions including:
+- Probability calculations for extreme events
+- Long-term trend analysis
+- Risk assessments
+- Return period calculations
+""".format(
+    description=APP_CONFIG.get('description', 'Analyze historical weather patterns and probabilities for any location and date.'),
+    version=APP_CONFIG.get('version', '1.0.0')
+)
+
+WELCOME_MD = """
+### 🚀 Getting Started
+
+1. **Configure Location**: Enter coordinates or search for a location
+2. **Select Date**: Choose the date you want to analyze
+3. **Choose Parameters**: Select weather parameters for analysis
+4. **Run Analysis**: Click the analyze button to get results
+
+### 📊 What You'll Get
+
+- **Probability Analysis**: Chances of extreme weather events
+- **Historical Trends**: Long-term patterns and changes
+- **Risk Assessment**: Comprehensive risk evaluation
+- **Statistical Insights**: Percentiles, return periods, and more
+
+### 🌍 Example Locations to Try
+
+- **New York**: 40.71, -74.01
+- **London**: 51.51, -0.13
+- **Tokyo**: 35.68, 139.65
+- **Sydney**: -33.87, 151.21
+"""
+
+
+# Page configuration
+st.set_page_config(
+    page_title=APP_CONFIG.get('title', 'Climatological Analysis'),
+    page_icon=UI_CONFIG['page_config']['page_icon'],
+    layout=UI_CONFIG['page_config']['layout'],
+    initial_sidebar_state=UI_CONFIG['page_config']['initial_sidebar_state']
+)
+
+# Custom CSS for better styling
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
 
 
 def main():
     """Main application function."""
     
-    # Title and description
-    st.markdown(f'<h1 class="main-header">🌤️ {APP_CONFIG["title"]}</h1>', 
-                unsafe_allow_html=True)
+    # No-op after the first run; Streamlit reruns this script on every interaction
+    configure_logging()
     
-    st.markdown(f"""
-    **{APP_CONFIG.get('description', 'Analyze historical weather patterns and probabilities for any location and date.')}**
+    # Title and description
+    st.markdown(MAIN_HEADER_HTML, unsafe_allow_html=True)
     
-    Version: {APP_CONFIG.get('version', '1.0.0')}
+    st.markdown(INTRO_MD)
     
-    This tool provides comprehensive statistical analysis of weather conditions including:
-    - Probability calculations for extreme events
-    - Long-term trend analysis
-    - Risk assessments
-    - Return period calculations
-    """)
+    _warmup_kernels()
     
     # Initialize session state
     if 'analysis_results' not in st.session_state:
         st.session_state.analysis_results = None
-    if 'processor' not in st.session_state:
-        st.session_state.processor = None
     
     # Sidebar for inputs
     with st.sidebar:
-        st.header("📍 Analysis Parameters")
-        
-        # API Configuration
-        with st.expander("🔧 API Configuration", expanded=False):
-            # Show current API status
-            api_status = get_api_status()
-            
-            if api_status['is_valid']:
-                st.success(f"✅ API Active: {api_status['username']} (Valid until: {api_status['valid_until']})")
-                st.info(f"📅 Days remaining: {api_status.get('days_remaining', 'N/A')}")
-            else:
-                st.warning(f"⚠️ API Status: {api_status['username']} (Expired or Invalid)")
-            
-            st.info("Your API credentials are configured in config.py")
-            
-            # Option to override credentials
-            st.markdown("**Override credentials (optional):**")
-            username = st.text_input("Username", value="", 
-                                    help="Leave empty to use configured credentials")
-            password = st.text_input("Password", value="", type="password",
-                                   help="Leave empty to use configured credentials")
-            
-            if st.button("🔗 Test Connection"):
-                try:
-                    if username and password:
-                        test_processor = WeatherQueryProcessor(username, password)
-                        st.success("✅ Connection test successful!")
-                    else:
-                        test_processor = WeatherQueryProcessor()
-                        st.success("✅ Using configured credentials - Connection OK!")
-                except Exception as e:
-                    st.error(f"❌ Connection failed: {e}")
-        
-        # Initialize processor if not done
-        if st.session_state.processor is None:
-            # Use configured credentials by default
-            st.session_state.processor = WeatherQueryProcessor()
-        
-        # Location input
-        st.subheader("🗺️ Location")
-        
-        # Location search
-        location_query = st.text_input("🔍 Search location", 
-                                     placeholder="e.g., New York, London, Tokyo")
-        
-        if location_query:
-            suggestions = st.session_state.processor.get_location_suggestions(location_query)
-            if suggestions:
-                selected_location = st.selectbox(
-                    "Select from suggestions:",
-                    options=suggestions,
-                    format_func=lambda x: f"{x['name']} ({x['lat']:.2f}, {x['lon']:.2f})"
-                )
-                latitude = selected_location['lat']
-                longitude = selected_location['lon']
-            else:
-                st.warning("No suggestions found. Enter coordinates manually.")
-                latitude = st.number_input("Latitude", value=40.7128, min_value=-90.0, max_value=90.0)
-                longitude = st.number_input("Longitude", value=-74.0060, min_value=-180.0, max_value=180.0)
-        else:
-            latitude = st.number_input("Latitude", value=40.7128, min_value=-90.0, max_value=90.0)
-            longitude = st.number_input("Longitude", value=-74.0060, min_value=-180.0, max_value=180.0)
-        
-        # Date input
-        st.subheader("📅 Analysis Date")
-        analysis_date = st.date_input(
-            "Select date for analysis",
-            value=datetime.now().date(),
-            help="The system will analyze historical data for this day of year"
-        )
-        
-        # Parameters selection
-        st.subheader("🌡️ Weather Parameters")
-        available_params = st.session_state.processor.data_client.get_available_parameters()
-        
-        selected_params = st.multiselect(
-            "Select parameters to analyze:",
-            options=list(available_params.keys()),
-            default=['t_2m:C', 'precip_24h:mm'],
-            format_func=lambda x: available_params[x]
-        )
-        
-        # Analysis settings
-        st.subheader("⚙️ Analysis Settings")
-        years_back = st.slider("Years of historical data", 10, 50, 30)
-        confidence_level = st.slider("Confidence level (%)", 80, 99, 95) / 100
-        
-        # Run analysis button
-        if st.button("🚀 Run Analysis", type="primary", use_container_width=True):
-            if not selected_params:
-                st.error("Please select at least one parameter")
-            else:
-                with st.spinner("Analyzing climatological data..."):
-                    try:
-                        location_dict = {'lat': latitude, 'lon': longitude}
-                        date_str = analysis_date.strftime('%Y-%m-%d')
-                        
-                        # Validate inputs
-                        errors = st.session_state.processor.validate_inputs(
-                            location_dict, date_str, selected_params
-                        )
-                        
-                        if errors:
-                            for error in errors:
-                                st.error(error)
-                        else:
-                            # Run analysis with configured or provided credentials
-                            if username and password:
-                                processor = WeatherQueryProcessor(username, password)
-                            else:
-                                processor = st.session_state.processor
-                                
-                            results = processor.process_query(
-                                location_dict, date_str, selected_params, years_back
-                            )
-                            st.session_state.analysis_results = results
-                            st.success("Analysis completed successfully!")
-                            
-                    except Exception as e:
-                        st.error(f"Analysis failed: {e}")
+        analysis_sidebar()
     
     # Main content area
     if st.session_state.analysis_results:
@@ -240,59 +219,194 @@ def main():
         display_welcome_screen()
 
 
+@st.fragment
+def analysis_sidebar():
+    """
+    Render the sidebar inputs and run the analysis.
+    
+    Runs as a fragment so that changing an input only reruns the sidebar;
+    the results area is redrawn only when a new analysis completes.
+    """
+    
+    st.header("📍 Analysis Parameters")
+    
+    # API Configuration
+    with st.expander("🔧 API Configuration", expanded=False):
+        # Show current API status
+        api_status = _cached_api_status()
+        
+        if api_status['is_valid']:
+            st.success(f"✅ API Active: {api_status['username']} (Valid until: {api_status['valid_until']})")
+            st.info(f"📅 Days remaining: {api_status.get('days_remaining', 'N/A')}")
+        else:
+            st.warning(f"⚠️ API Status: {api_status['username']} (Expired or Invalid)")
+        
+        st.info("Your API credentials are configured in config.py")
+        
+        # Option to override credentials
+        st.markdown("**Override credentials (optional):**")
+        username = st.text_input("Username", value="", 
+                                help="Leave empty to use configured credentials")
+        password = st.text_input("Password", value="", type="password",
+                               help="Leave empty to use configured credentials")
+        
+        if st.button("🔗 Test Connection"):
+            try:
+                if username and password:
+                    test_processor = _processor_for(username, password)
+                else:
+                    test_processor = _get_processor()
+                
+                # Constructing a client makes no request; validate() does
+                if test_processor.data_client.validate():
+                    st.success("✅ Connection test successful!")
+                else:
+                    st.error("❌ Connection failed: credentials were rejected or the API is unreachable")
+            except Exception as e:
+                st.error(f"❌ Connection failed: {e}")
+    
+    # Shared processor using configured credentials by default
+    default_processor = _get_processor()
+    
+    # Location input
+    st.subheader("🗺️ Location")
+    
+    # Location search
+    location_query = st.text_input("🔍 Search location", 
+                                 placeholder="e.g., New York, London, Tokyo")
+    
+    if location_query:
+        suggestions = _location_suggestions(default_processor, location_query)
+        if suggestions:
+            selected_location = st.selectbox(
+                "Select from suggestions:",
+                options=suggestions,
+                format_func=lambda x: f"{x['name']} ({x['lat']:.2f}, {x['lon']:.2f})"
+            )
+            latitude = selected_location['lat']
+            longitude = selected_location['lon']
+        else:
+            st.warning("No suggestions found. Enter coordinates manually.")
+            latitude = st.number_input("Latitude", value=40.7128, min_value=-90.0, max_value=90.0)
+            longitude = st.number_input("Longitude", value=-74.0060, min_value=-180.0, max_value=180.0)
+    else:
+        latitude = st.number_input("Latitude", value=40.7128, min_value=-90.0, max_value=90.0)
+        longitude = st.number_input("Longitude", value=-74.0060, min_value=-180.0, max_value=180.0)
+    
+    # Date input
+    st.subheader("📅 Analysis Date")
+    analysis_date = st.date_input(
+        "Select date for analysis",
+        value=datetime.now().date(),
+        help="The system will analyze historical data for this day of year"
+    )
+    
+    # Parameters selection
+    st.subheader("🌡️ Weather Parameters")
+    available_params = default_processor.data_client.get_available_parameters()
+    
+    selected_params = st.multiselect(
+        "Select parameters to analyze:",
+        options=list(available_params.keys()),
+        default=['t_2m:C', 'precip_24h:mm'],
+        format_func=lambda x: available_params[x]
+    )
+    
+    # Analysis settings
+    st.subheader("⚙️ Analysis Settings")
+    years_back = st.slider("Years of historical data", 10, 50, 30)
+    confidence_level = st.slider("Confidence level (%)", 80, 99, 95) / 100
+    
+    # Run analysis button
+    if st.button("🚀 Run Analysis", type="primary", use_container_width=True):
+        if not selected_params:
+            st.error("Please select at least one parameter")
+        else:
+            with st.spinner("Analyzing climatological data..."):
+                try:
+                    location_dict = {'lat': latitude, 'lon': longitude}
+                    
+                    # Validate inputs, keeping the parsed date for the analysis
+                    errors, query_date = default_processor.parse_and_validate(
+                        location_dict, analysis_date, selected_params
+                    )
+                    
+                    if errors:
+                        for error in errors:
+                            st.error(error)
+                    else:
+                        # Run analysis with configured or provided credentials
+                        if username and password:
+                            processor = _processor_for(username, password)
+                        else:
+                            processor = default_processor
+                            
+                        client = processor.data_client
+                        results = cached_process_query(
+                            processor, client.username, _password_digest(client.password),
+                            (latitude, longitude), query_date,
+                            tuple(selected_params), years_back
+                        )
+                        st.session_state.analysis_results = results
+                        st.toast("Analysis completed successfully!")
+                        
+                        # Rerun the whole app so the main area shows the new results
+                        st.rerun()
+                        
+                except Exception as e:
+                    st.error(f"Analysis failed: {e}")
+
+
 def display_welcome_screen():
     """Display welcome screen with instructions."""
     
     col1, col2, col3 = st.columns([1, 2, 1])
     
     with col2:
-        st.markdown("""
-        ### 🚀 Getting Started
-        
-        1. **Configure Location**: Enter coordinates or search for a location
-        2. **Select Date**: Choose the date you want to analyze
-        3. **Choose Parameters**: Select weather parameters for analysis
-        4. **Run Analysis**: Click the analyze button to get results
-        
-        ### 📊 What You'll Get
-        
-        - **Probability Analysis**: Chances of extreme weather events
-        - **Historical Trends**: Long-term patterns and changes
-        - **Risk Assessment**: Comprehensive risk evaluation
-        - **Statistical Insights**: Percentiles, return periods, and more
-        
-        ### 🌍 Example Locations to Try
-        
-        - **New York**: 40.71, -74.01
-        - **London**: 51.51, -0.13
-        - **Tokyo**: 35.68, 139.65
-        - **Sydney**: -33.87, 151.21
-        """)
+        st.markdown(WELCOME_MD)
         
         # Sample data visualization
         st.subheader("📈 Sample Analysis Preview")
         
-        # Create sample data
-        dates = pd.date_range(start='1990-01-01', end='2023-12-31', freq='YS')
-        sample_temps = 20 + 3 * np.sin(2 * np.pi * np.arange(len(dates)) / 10) + np.random.normal(0, 2, len(dates))
-        
-        fig = go.Figure()
-        fig.add_trace(go.Scatter(
-            x=dates,
-            y=sample_temps,
-            mode='lines+markers',
-            name='Annual Temperature',
-            line=dict(color='#1f77b4', width=2)
-        ))
-        
-        fig.update_layout(
-            title="Sample: Historical Temperature Trend",
-            xaxis_title="Year",
-            yaxis_title="Temperature (°C)",
-            height=400
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(_sample_trend_fig(), use_container_width=True)
+
+
+@st.cache_resource
+def _sample_trend_fig():
+    """Build the static welcome-screen sample chart once per process."""
+    
+    # Create sample data
+    rng = np.random.default_rng(0)
+    dates = pd.date_range(start='1990-01-01', end='2023-12-31', freq='YS')
+    
+    # 20 + 3 * sin(2 * pi * t / 10) + noise, computed in a single buffer
+    n = len(dates)
+    sample_temps = np.arange(n, dtype=np.float64)
+    sample_temps *= 2 * np.pi / 10
+    np.sin(sample_temps, out=sample_temps)
+    sample_temps *= 3
+    sample_temps += 20
+    noise = rng.standard_normal(n)
+    noise *= 2
+    sample_temps += noise
+    
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(
+        x=dates,
+        y=sample_temps,
+        mode='lines+markers',
+        name='Annual Temperature',
+        line=dict(color='#1f77b4', width=2)
+    ))
+    
+    fig.update_layout(
+        title="Sample: Historical Temperature Trend",
+        xaxis_title="Year",
+        yaxis_title="Temperature (°C)",
+        height=400
+    )
+    
+    return fig
 
 
 def display_results(results):
@@ -393,7 +507,7 @@ def display_parameter_analysis(parameter, analysis):
     if percentiles:
         st.markdown("### 📊 Percentile Analysis")
         
-        fig = create_percentile_chart(percentiles, param_info.get('units', ''))
+        fig = _percentile_fig(tuple(percentiles.items()), param_info.get('units', ''))
         st.plotly_chart(fig, use_container_width=True)
     
     # Trend analysis
@@ -426,16 +540,15 @@ def display_parameter_analysis(parameter, analysis):
         return_values = extreme_vals['return_values']
         
         # Create return period chart
-        fig = create_return_period_chart(return_values, param_info.get('units', ''))
+        fig = _return_period_fig(tuple(return_values.items()), param_info.get('units', ''))
         st.plotly_chart(fig, use_container_width=True)
         
         # Return period table
         st.markdown("**Return Period Values:**")
-        return_df = pd.DataFrame([
-            {"Return Period": period.replace('_year', ' years'), 
-             "Expected Value": f"{value:.2f}"}
-            for period, value in return_values.items()
-        ])
+        return_df = pd.DataFrame({
+            "Return Period": [period.replace('_year', ' years') for period in return_values],
+            "Expected Value": [f"{value:.2f}" for value in return_values.values()]
+        })
         st.dataframe(return_df, use_container_width=True)
     
     # Interpretation
@@ -449,32 +562,38 @@ def display_parameter_analysis(parameter, analysis):
                 st.write(f"**{formatted_key}:** {value}")
 
 
+# cache_data rather than cache_resource: bounded, and every caller gets its own
+# copy of the figure, so one session's changes never reach another's
+@st.cache_data(ttl=CACHE_CONFIG['ttl_seconds'], max_entries=CACHE_CONFIG['max_size'])
+def _percentile_fig(items, units):
+    """Percentile chart cached on its (label, value) pairs."""
+    return create_percentile_chart(dict(items), units)
+
+
+@st.cache_data(ttl=CACHE_CONFIG['ttl_seconds'], max_entries=CACHE_CONFIG['max_size'])
+def _return_period_fig(items, units):
+    """Return period chart cached on its (period, value) pairs."""
+    return create_return_period_chart(dict(items), units)
+
+
 def create_percentile_chart(percentiles, units):
     """Create percentile visualization chart."""
     
     percentile_values = list(percentiles.keys())
     percentile_data = list(percentiles.values())
     
-    fig = go.Figure()
-    
     # Add percentile bars
-    fig.add_trace(go.Bar(
+    fig = go.Figure(data=[go.Bar(
         x=percentile_values,
         y=percentile_data,
-        marker_color=['#d62728' if 'p9' in p else '#ff7f0e' if 'p7' in p or 'p8' in p 
-                     else '#2ca02c' if 'p5' in p else '#1f77b4' for p in percentile_values],
+        marker_color=[PERCENTILE_COLORS.get(p[:2], DEFAULT_PERCENTILE_COLOR) 
+                      for p in percentile_values],
         text=[f"{val:.1f}" for val in percentile_data],
         textposition='auto',
         name='Percentiles'
-    ))
+    )], layout=PERCENTILE_LAYOUT)
     
-    fig.update_layout(
-        title="Historical Percentile Distribution",
-        xaxis_title="Percentile",
-        yaxis_title=f"Value ({units})",
-        showlegend=False,
-        height=400
-    )
+    fig.update_layout(yaxis_title=f"Value ({units})")
     
     return fig
 
@@ -485,25 +604,16 @@ def create_return_period_chart(return_values, units):
     periods = [int(k.replace('_year', '')) for k in return_values.keys()]
     values = list(return_values.values())
     
-    fig = go.Figure()
-    
-    fig.add_trace(go.Scatter(
+    fig = go.Figure(data=[go.Scattergl(
         x=periods,
         y=values,
         mode='lines+markers',
         marker=dict(size=8, color='#e74c3c'),
         line=dict(width=3, color='#e74c3c'),
         name='Return Values'
-    ))
+    )], layout=RETURN_PERIOD_LAYOUT)
     
-    fig.update_layout(
-        title="Return Period Analysis",
-        xaxis_title="Return Period (Years)",
-        yaxis_title=f"Expected Value ({units})",
-        xaxis_type="log",
-        height=400,
-        showlegend=False
-    )
+    fig.update_layout(yaxis_title=f"Expected Value ({units})")
     
     return fig
 
@@ -511,9 +621,11 @@ def create_return_period_chart(return_values, units):
 def create_historical_trend_chart(data, dates, parameter):
     """Create historical trend visualization."""
     
-    fig = go.Figure()
+    data = np.asarray(data, dtype=float)
     
-    fig.add_trace(go.Scatter(
+    fig = go.Figure(layout=TREND_LAYOUT)
+    
+    fig.add_trace(go.Scattergl(
         x=dates,
         y=data,
         mode='lines+markers',
@@ -524,10 +636,14 @@ def create_historical_trend_chart(data, dates, parameter):
     
     # Add trend line
     if len(data) > 1:
-        z = np.polyfit(range(len(data)), data, 1)
-        trend_line = np.poly1d(z)(range(len(data)))
-        
-        fig.add_trace(go.Scatter(
+        # Closed-form least squares fit of a straight line
+        x = np.arange(len(data), dtype=np.float64)
+        x_dev = x - x.mean()
+        y_mean = data.mean()
+        slope = (x_dev * (data - y_mean)).sum() / (x_dev ** 2).sum()
+        trend_line = y_mean + slope * x_dev
+        
+        fig.add_trace(go.Scattergl(
             x=dates,
             y=trend_line,
             mode='lines',
@@ -535,12 +651,7 @@ def create_historical_trend_chart(data, dates, parameter):
             line=dict(dash='dash', color='red', width=2)
         ))
     
-    fig.update_layout(
-        title=f"Historical Trend: {parameter}",
-        xaxis_title="Year",
-        yaxis_title="Value",
-        height=400
-    )
+    fig.update_layout(title=f"Historical Trend: {parameter}")
     
     return fig
 
@@ -0,0 +1,104 @@
+"""
+Build the precomputed climatology store read by the query processor.
+
+Fetches daily historical series for every default location and available
+parameter from the Meteomatics API and writes them as Parquet partitions
+(see src/climatology_store.py). Queries for these locations are then answered
+from disk instead of the API. Re-run it periodically, e.g. once a year:
+
+    python build_climatology.py [--years 30]
+"""
+
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta
+
+import meteomatics.api as mtm
+import pandas as pd
+
+from config import DEFAULT_LOCATIONS, CLIMATOLOGY_CONFIG, get_meteomatics_credentials
+from src.climatology_store import partition_path, pyarrow
+from src.meteomatics_client import MeteomaticsClient
+
+
+def build_location(location: dict, parameters: list, years_back: int,
+                   username: str, password: str) -> int:
+    """
+    Fetch and store the daily series of all parameters for one location.
+    
+    Args:
+        location: Dict with 'name', 'lat' and 'lon'
+        parameters: Weather parameters to store
+        years_back: Number of full years before the current one to store
+        username: Meteomatics API username
+        password: Meteomatics API password
+    
+    Returns:
+        Number of partitions written
+    """
+    current_year = datetime.now().year
+    start_date = datetime(current_year - years_back, 1, 1)
+    end_date = datetime(current_year - 1, 12, 31)
+    
+    df = mtm.query_time_series(
+        [(location['lat'], location['lon'])],
+        start_date,
+        end_date,
+        timedelta(days=1),
+        parameters,
+        username,
+        password,
+        model='mix'
+    )
+    
+    dates = df.index.get_level_values('validdate')
+    written = 0
+    for param in parameters:
+        if param not in df.columns:
+            continue
+        
+        partition = pd.DataFrame({
+            'year': dates.year,
+            'doy': dates.dayofyear,
+            'value': df[param].to_numpy()
+        })
+        path = partition_path(location['lat'], location['lon'], param)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        partition.to_parquet(path, index=False)
+        written += 1
+    
+    return written
+
+
+def main():
+    """Build the climatology store for all default locations."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--years', type=int, default=CLIMATOLOGY_CONFIG['years_back'],
+                        help='Number of past years to store')
+    args = parser.parse_args()
+    
+    if pyarrow is None:
+        print("❌ pyarrow is required to write the climatology store")
+        print("💡 Install it with: pip install pyarrow")
+        return 1
+    
+    username, password = get_meteomatics_credentials()
+    parameters = list(MeteomaticsClient(username, password).get_available_parameters())
+    
+    print(f"🌍 Building {args.years}-year climatology in {CLIMATOLOGY_CONFIG['path']}")
+    failures = 0
+    for location in DEFAULT_LOCATIONS:
+        try:
+            written = build_location(location, parameters, args.years, username, password)
+            print(f"✅ {location['name']}: {written} parameters")
+        except Exception as e:
+            failures += 1
+            print(f"❌ {location['name']}: {e}")
+    
+    print(f"🎉 Done ({len(DEFAULT_LOCATIONS) - failures}/{len(DEFAULT_LOCATIONS)} locations)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,7 +3,9 @@ Configuration file for Climatological Probability Analysis
 Contains API credentials and application settings
 """
 
+import logging
 import os
+import time
 from datetime import datetime
 
 # Meteomatics API Configuration
@@ -14,6 +16,10 @@ METEOMATICS_CONFIG = {
     'base_url': 'https://api.meteomatics.com'
 }
 
+# Expiry date of the credentials, parsed once at import
+_VALID_UNTIL_DT = datetime.strptime(METEOMATICS_CONFIG['valid_until'], '%Y-%m-%d')
+_VALID_UNTIL_TS = _VALID_UNTIL_DT.timestamp()
+
 # Application Settings
 APP_CONFIG = {
     'title': 'Climatological Probability Analysis',
@@ -137,11 +143,7 @@ def is_api_valid():
     Returns:
         bool: True if valid, False if expired
     """
-    try:
-        valid_until = datetime.strptime(METEOMATICS_CONFIG['valid_until'], '%Y-%m-%d')
-        return datetime.now() <= valid_until
-    except:
-        return False
+    return time.time() <= _VALID_UNTIL_TS
 
 def get_api_status():
     """
@@ -154,7 +156,7 @@ def get_api_status():
         'username': METEOMATICS_CONFIG['username'],
         'valid_until': METEOMATICS_CONFIG['valid_until'],
         'is_valid': is_api_valid(),
-        'days_remaining': (datetime.strptime(METEOMATICS_CONFIG['valid_until'], '%Y-%m-%d') - datetime.now()).days
+        'days_remaining': int((_VALID_UNTIL_TS - time.time()) // 86400)
     }
 
 # Environment-specific settings
@@ -177,9 +179,28 @@ LOGGING_CONFIG = {
     'file': 'climatological_analysis.log' if is_production() else None
 }
 
+def configure_logging(level=None):
+    """Configure logging for entry-point scripts: 'src' loggers per LOGGING_CONFIG, others at WARNING"""
+    logging.basicConfig(level=logging.WARNING, format=LOGGING_CONFIG['format'],
+                        filename=LOGGING_CONFIG['file'])
+    logging.getLogger('src').setLevel(level or LOGGING_CONFIG['level'])
+
 # Cache configuration
 CACHE_CONFIG = {
     'enabled': True,
     'ttl_seconds': 3600,  # 1 hour
-    'max_size': 100  # Maximum number of cached requests
+    'max_size': 100,  # Maximum number of cached requests
+    # Persistent cache of real historical data (requires the optional diskcache package)
+    'disk_cache_dir': os.path.expanduser('~/.nasa_weather_cache'),
+    'disk_size_limit': 2 ** 30,  # 1 GB
+    'disk_ttl_seconds': 7 * 86400  # 1 week
+}
+
+# Precomputed climatology written by build_climatology.py (requires pyarrow)
+CLIMATOLOGY_CONFIG = {
+    'enabled': True,
+    'path': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'climatology'),
+    'years_back': 30,
+    # Share of the requested years the store must hold to answer a query
+    'min_coverage': 0.9
 }
@@ -3,12 +3,11 @@ Example usage script for the Climatological Probability Analysis system.
 """
 
 import sys
-import os
+import io
+import functools
 from datetime import datetime
 
-# Add src directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
-
+from config import configure_logging
 from src.weather_query_processor import WeatherQueryProcessor
 from src.meteomatics_client import MeteomaticsClient
 from src.climatological_analyzer import ClimatologicalAnalyzer
@@ -36,7 +35,11 @@ def example_analysis():
     print(f"📅 Analysis Date: {analysis_date}")
     print(f"🌡️ Parameters: {', '.join(parameters)}")
     print(f"📊 Historical Period: 30 years")
-    print("\n🔄 Running analysis...")
+    print("\n🔄 Running analysis...", flush=True)
+    
+    # Buffer the report and write it in one go
+    report = io.StringIO()
+    emit = functools.partial(print, file=report)
     
     try:
         # Run the analysis
@@ -47,90 +50,93 @@ def example_analysis():
             analysis_years=30
         )
         
-        print("✅ Analysis completed successfully!\n")
+        emit("✅ Analysis completed successfully!\n")
         
         # Display summary
         summary = results.get('summary', {})
-        print("📋 SUMMARY")
-        print("-" * 20)
-        print(f"Parameters analyzed: {summary.get('successful_analyses', 0)}")
-        print(f"Failed analyses: {summary.get('failed_analyses', 0)}")
-        print(f"Dominant risk level: {summary.get('dominant_risk_level', 'Unknown')}")
+        emit("📋 SUMMARY")
+        emit("-" * 20)
+        emit(f"Parameters analyzed: {summary.get('successful_analyses', 0)}")
+        emit(f"Failed analyses: {summary.get('failed_analyses', 0)}")
+        emit(f"Dominant risk level: {summary.get('dominant_risk_level', 'Unknown')}")
         
         if summary.get('key_findings'):
-            print("\n🔍 Key Findings:")
+            emit("\n🔍 Key Findings:")
             for finding in summary['key_findings']:
-                print(f"  • {finding}")
+                emit(f"  • {finding}")
         
         # Display parameter results
         param_results = results.get('parameters', {})
         
         for param, analysis in param_results.items():
-            print(f"\n📊 {param.upper()} ANALYSIS")
-            print("=" * 30)
+            emit(f"\n📊 {param.upper()} ANALYSIS")
+            emit("=" * 30)
             
             if 'error' in analysis:
-                print(f"❌ Error: {analysis['error']}")
+                emit(f"❌ Error: {analysis['error']}")
                 continue
             
             # Basic statistics
             basic_stats = analysis.get('basic_stats', {})
-            print(f"Mean: {basic_stats.get('mean', 0):.2f}")
-            print(f"Std Dev: {basic_stats.get('std_dev', 0):.2f}")
-            print(f"Min: {basic_stats.get('min_recorded', 0):.2f}")
-            print(f"Max: {basic_stats.get('max_recorded', 0):.2f}")
-            print(f"Data years: {basic_stats.get('data_years', 0)}")
+            emit(f"Mean: {basic_stats.get('mean', 0):.2f}")
+            emit(f"Std Dev: {basic_stats.get('std_dev', 0):.2f}")
+            emit(f"Min: {basic_stats.get('min_recorded', 0):.2f}")
+            emit(f"Max: {basic_stats.get('max_recorded', 0):.2f}")
+            emit(f"Data years: {basic_stats.get('data_years', 0)}")
             
             # Risk assessment
             risk_category = analysis.get('risk_category', 'Unknown')
-            print(f"Risk category: {risk_category}")
+            emit(f"Risk category: {risk_category}")
             
             # Probabilities
             if 'very_hot_probability' in analysis:
                 hot_prob = analysis['very_hot_probability'] * 100
-                print(f"Extreme heat probability: {hot_prob:.1f}%")
+                emit(f"Extreme heat probability: {hot_prob:.1f}%")
             
             if 'very_cold_probability' in analysis:
                 cold_prob = analysis['very_cold_probability'] * 100
-                print(f"Extreme cold probability: {cold_prob:.1f}%")
+                emit(f"Extreme cold probability: {cold_prob:.1f}%")
             
             if 'comfortable_probability' in analysis:
                 comfort_prob = analysis['comfortable_probability'] * 100
-                print(f"Comfortable conditions: {comfort_prob:.1f}%")
+                emit(f"Comfortable conditions: {comfort_prob:.1f}%")
             
             # Trend analysis
             trend = analysis.get('trend_analysis', {})
             if trend and not trend.get('error'):
                 if trend.get('significant', False):
                     direction = trend.get('direction', 'unknown')
-                    print(f"Trend: Significant {direction} trend detected")
+                    emit(f"Trend: Significant {direction} trend detected")
                 else:
-                    print("Trend: No significant trend")
+                    emit("Trend: No significant trend")
             
             # Percentiles
             percentiles = analysis.get('percentiles', {})
             if percentiles:
-                print("Percentiles:")
+                emit("Percentiles:")
                 for p, value in percentiles.items():
-                    print(f"  {p}: {value:.2f}")
+                    emit(f"  {p}: {value:.2f}")
             
             # Interpretation
             interpretation = analysis.get('interpretation', {})
             if interpretation:
-                print("Interpretation:")
+                emit("Interpretation:")
                 for key, value in interpretation.items():
                     if key != 'error':
                         formatted_key = key.replace('_', ' ').title()
-                        print(f"  {formatted_key}: {value}")
+                        emit(f"  {formatted_key}: {value}")
         
-        print("\n" + "=" * 50)
-        print("🎉 Example analysis completed!")
-        print("📚 Check the README.md for more usage instructions.")
-        print("🚀 Run 'streamlit run app.py' to start the web interface.")
+        emit("\n" + "=" * 50)
+        emit("🎉 Example analysis completed!")
+        emit("📚 Check the README.md for more usage instructions.")
+        emit("🚀 Run 'streamlit run app.py' to start the web interface.")
         
     except Exception as e:
-        print(f"❌ Analysis failed: {e}")
-        print("💡 Try running with demo data or check your API credentials.")
+        emit(f"❌ Analysis failed: {e}")
+        emit("💡 Try running with demo data or check your API credentials.")
+    finally:
+        sys.stdout.write(report.getvalue())
+        sys.stdout.flush()
 
 
 def simple_temperature_analysis():
@@ -165,31 +171,38 @@ def simple_temperature_analysis():
     # Run analysis
     assessment = analyzer.generate_risk_assessment(thresholds)
     
-    # Display results
-    print(f"\n📈 Results:")
-    print(f"Mean temperature: {assessment['basic_stats']['mean']:.1f}°C")
-    print(f"Standard deviation: {assessment['basic_stats']['std_dev']:.1f}°C")
-    print(f"Temperature range: {assessment['basic_stats']['min_recorded']:.1f}°C to {assessment['basic_stats']['max_recorded']:.1f}°C")
+    # Display results, buffered and written in one go
+    report = io.StringIO()
+    emit = functools.partial(print, file=report)
+    emit(f"\n📈 Results:")
+    emit(f"Mean temperature: {assessment['basic_stats']['mean']:.1f}°C")
+    emit(f"Standard deviation: {assessment['basic_stats']['std_dev']:.1f}°C")
+    emit(f"Temperature range: {assessment['basic_stats']['min_recorded']:.1f}°C to {assessment['basic_stats']['max_recorded']:.1f}°C")
     
     if 'very_hot_probability' in assessment:
         hot_prob = assessment['very_hot_probability'] * 100
-        print(f"Probability of hot day (>32°C): {hot_prob:.1f}%")
+        emit(f"Probability of hot day (>32°C): {hot_prob:.1f}%")
     
     if 'comfortable_probability' in assessment:
         comfort_prob = assessment['comfortable_probability'] * 100
-        print(f"Probability of comfortable day (20-28°C): {comfort_prob:.1f}%")
+        emit(f"Probability of comfortable day (20-28°C): {comfort_prob:.1f}%")
     
-    print(f"Risk category: {assessment['risk_category']}")
+    emit(f"Risk category: {assessment['risk_category']}")
     
     # Show percentiles
     percentiles = assessment['percentiles']
-    print(f"\nPercentiles:")
-    print(f"  10th percentile: {percentiles['p10']:.1f}°C")
-    print(f"  50th percentile (median): {percentiles['p50']:.1f}°C")
-    print(f"  90th percentile: {percentiles['p90']:.1f}°C")
+    emit(f"\nPercentiles:")
+    emit(f"  10th percentile: {percentiles['p10']:.1f}°C")
+    emit(f"  50th percentile (median): {percentiles['p50']:.1f}°C")
+    emit(f"  90th percentile: {percentiles['p90']:.1f}°C")
+    
+    sys.stdout.write(report.getvalue())
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
+    configure_logging()
+    
     # Run example analysis
     example_analysis()
     
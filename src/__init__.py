@@ -0,0 +1,3 @@
+"""
+Core modules of the Climatological Probability Analysis system.
+"""
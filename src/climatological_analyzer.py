@@ -5,22 +5,158 @@ Statistical analysis module for climatological probability calculations.
 import numpy as np
 import pandas as pd
 from scipy import stats
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, NamedTuple, Mapping, Union
 import warnings
+import functools
+import math
+import logging
+
+try:
+    import numba
+except ImportError:
+    # Optional: only needed for the 'numba' engine
+    numba = None
+
+logger = logging.getLogger(__name__)
+
+# Percentiles reported by get_percentiles (p50 is the median)
+PERCENTILES = (10, 25, 50, 75, 90, 95, 99)
+
+# Return periods (years) reported by get_extreme_value_analysis
+RETURN_PERIODS = (2, 5, 10, 20, 50, 100)
+
+
+class BasicStats(NamedTuple):
+    """Summary statistics of an analyzer's data, computed once at construction."""
+    mean: float
+    median: float
+    std_dev: float
+    min_recorded: float
+    max_recorded: float
+    data_years: int
+
+
+class ParamThresholds(NamedTuple):
+    """Thresholds used by generate_risk_assessment; NaN marks an unset threshold."""
+    hot: float = math.nan
+    cold: float = math.nan
+    comfort_min: float = math.nan
+    comfort_max: float = math.nan
+    
+    @classmethod
+    def from_mapping(cls, thresholds: Mapping[str, Any]) -> 'ParamThresholds':
+        """
+        Build from a threshold dictionary as in config.PARAMETER_THRESHOLDS.
+        
+        Args:
+            thresholds: Dictionary with 'hot', 'cold' and 'comfortable'
+                        ({'min', 'max'}) entries, each optional
+        
+        Returns:
+            The thresholds, with missing entries set to NaN
+        """
+        comfort = thresholds.get('comfortable') or {}
+        return cls(thresholds.get('hot', math.nan), thresholds.get('cold', math.nan),
+                   comfort.get('min', math.nan), comfort.get('max', math.nan))
+
+
+def _basic_stats_kernel(data: np.ndarray) -> Tuple[float, float, float, float]:
+    """Mean, standard deviation, minimum and maximum of a 1-D array."""
+    n = data.shape[0]
+    total = 0.0
+    minimum = data[0]
+    maximum = data[0]
+    for value in data:
+        total += value
+        if value < minimum:
+            minimum = value
+        if value > maximum:
+            maximum = value
+    
+    mean = total / n
+    squared_dev = 0.0
+    for value in data:
+        squared_dev += (value - mean) ** 2
+    
+    return mean, np.sqrt(squared_dev / n), minimum, maximum
+
+
+def _count_exceeds_kernel(sorted_data: np.ndarray, threshold: float) -> int:
+    """Number of values strictly above threshold in an ascending array."""
+    return sorted_data.shape[0] - np.searchsorted(sorted_data, threshold, side='right')
+
+
+def _count_below_kernel(sorted_data: np.ndarray, threshold: float) -> int:
+    """Number of values strictly below threshold in an ascending array."""
+    return np.searchsorted(sorted_data, threshold, side='left')
+
+
+def _count_between_kernel(sorted_data: np.ndarray, low: float, high: float) -> int:
+    """Number of values within [low, high] in an ascending array."""
+    count = (np.searchsorted(sorted_data, high, side='right') -
+             np.searchsorted(sorted_data, low, side='left'))
+    return max(count, 0)
+
+
+if numba is not None:
+    _basic_stats_numba = numba.njit(cache=True, fastmath=True)(_basic_stats_kernel)
+    # No fastmath here: threshold comparisons must keep IEEE semantics
+    _count_exceeds_numba = numba.njit(cache=True)(_count_exceeds_kernel)
+    _count_below_numba = numba.njit(cache=True)(_count_below_kernel)
+    _count_between_numba = numba.njit(cache=True)(_count_between_kernel)
+
+
+def warmup_numba() -> None:
+    """Compile the numba kernels ahead of the first analysis, if numba is installed."""
+    if numba is not None:
+        # float32 is what the query pipeline carries, float64 what other callers
+        # pass; thresholds always reach the kernels as Python floats
+        for dtype in (np.float32, np.float64):
+            sample = np.zeros(2, dtype=dtype)
+            _basic_stats_numba(sample)
+            _count_exceeds_numba(sample, 0.0)
+            _count_below_numba(sample, 0.0)
+            _count_between_numba(sample, 0.0, 1.0)
+
+
+@functools.lru_cache(maxsize=256)
+def _critical_value(confidence_level: float, n: int) -> float:
+    """Two-sided critical value: Student's t for small samples, normal otherwise."""
+    alpha = 1 - confidence_level
+    if n < 30:
+        return stats.t.ppf(1 - alpha/2, n - 1)
+    return stats.norm.ppf(1 - alpha/2)
 
 
 class ClimatologicalAnalyzer:
     """Analyzer for calculating climatological probabilities and risk assessments."""
     
-    def __init__(self, historical_data: np.ndarray):
+    def __init__(self, historical_data: np.ndarray, engine: str = None):
         """
         Initialize with historical data array.
         
         Args:
             historical_data: numpy array of values across years
+            engine: 'numpy' or 'numba' for the statistics kernels
+                    (defaults to 'numba' when it is installed)
         """
-        self.data = np.array(historical_data)
-        self.data = self.data[~np.isnan(self.data)]  # Remove NaN values
+        if engine is None:
+            engine = 'numpy' if numba is None else 'numba'
+        if engine not in ('numpy', 'numba'):
+            raise ValueError("Engine must be 'numpy' or 'numba'")
+        if engine == 'numba' and numba is None:
+            raise ImportError("numba is required for engine='numba'")
+        self.engine = engine
+        
+        # Clean float input is used as-is; only NaN-bearing data is copied.
+        # float32 input keeps its narrower dtype, anything else becomes float64.
+        data = np.asarray(historical_data)
+        data = np.ascontiguousarray(
+            data, dtype=np.float32 if data.dtype == np.float32 else np.float64)
+        nan_mask = np.isnan(data)
+        if nan_mask.any():
+            data = data[~nan_mask]  # Remove NaN values
+        self.data = data
         self.n_years = len(self.data)
         
         if self.n_years == 0:
@@ -28,6 +164,48 @@ class ClimatologicalAnalyzer:
         
         if self.n_years < 10:
             warnings.warn(f"Only {self.n_years} years of data available. Results may be less reliable.")
+        
+        # Summary statistics shared by all analysis methods
+        self._sorted = np.sort(self.data)
+        mean, std_dev, minimum, maximum = self._basic_stats()
+        self.summary = BasicStats(mean, float(np.median(self._sorted)), std_dev,
+                                  minimum, maximum, self.n_years)
+        # Sum of squared deviations from the mean, for incremental updates
+        self._m2 = std_dev ** 2 * self.n_years
+    
+    def update(self, new_values: np.ndarray) -> None:
+        """
+        Add new observations (e.g. one more year) to the analysis.
+        
+        Mean and standard deviation are combined with the existing values
+        using the parallel form of Welford's algorithm, and the new values are
+        merged into the sorted data, so nothing is recomputed from scratch.
+        
+        Args:
+            new_values: Array of additional values (NaN values are ignored)
+        """
+        batch = np.asarray(new_values, dtype=self.data.dtype).ravel()
+        batch = np.sort(batch[~np.isnan(batch)])
+        if batch.size == 0:
+            return
+        
+        n_a, n_b = self.n_years, batch.size
+        n = n_a + n_b
+        mean_b = batch.mean(dtype=np.float64)
+        m2_b = np.square(batch - mean_b).sum()
+        
+        delta = mean_b - self.summary.mean
+        mean = self.summary.mean + delta * n_b / n
+        self._m2 += m2_b + delta ** 2 * n_a * n_b / n
+        
+        self.data = np.concatenate((self.data, batch))
+        self._sorted = np.insert(self._sorted, np.searchsorted(self._sorted, batch), batch)
+        self.n_years = n
+        
+        median = float(self._sorted[(n - 1) // 2] + self._sorted[n // 2]) / 2
+        self.summary = BasicStats(mean, median, np.sqrt(self._m2 / n),
+                                  min(self.summary.min_recorded, batch[0]),
+                                  max(self.summary.max_recorded, batch[-1]), n)
     
     def calculate_probability(self, threshold: float, condition: str = 'exceeds') -> float:
         """
@@ -40,12 +218,20 @@ class ClimatologicalAnalyzer:
         Returns:
             Probability (0-1)
         """
+        if condition not in ('exceeds', 'below'):
+            raise ValueError("Condition must be 'exceeds' or 'below'")
+        
+        threshold = float(threshold)  # One kernel signature, whatever the caller passes
+        if math.isnan(threshold):
+            # No value compares true against NaN; searchsorted would sort it last
+            return 0.0
+        
+        # Binary search on the sorted cache instead of materializing a bool mask
+        jit = self.engine == 'numba'
         if condition == 'exceeds':
-            count = np.sum(self.data > threshold)
-        elif condition == 'below':
-            count = np.sum(self.data < threshold)
+            count = (_count_exceeds_numba if jit else _count_exceeds_kernel)(self._sorted, threshold)
         else:
-            raise ValueError("Condition must be 'exceeds' or 'below'")
+            count = (_count_below_numba if jit else _count_below_kernel)(self._sorted, threshold)
         
         probability = count / self.n_years
         return probability
@@ -57,15 +243,9 @@ class ClimatologicalAnalyzer:
         Returns:
             Dictionary of percentile values
         """
-        return {
-            'p10': np.percentile(self.data, 10),
-            'p25': np.percentile(self.data, 25),
-            'p50': np.percentile(self.data, 50),  # Median
-            'p75': np.percentile(self.data, 75),
-            'p90': np.percentile(self.data, 90),
-            'p95': np.percentile(self.data, 95),
-            'p99': np.percentile(self.data, 99)
-        }
+        # One call partitions the data once for all percentiles
+        values = np.percentile(self._sorted, PERCENTILES)
+        return {f'p{q}': value for q, value in zip(PERCENTILES, values)}
     
     def detect_trend(self) -> Dict[str, Any]:
         """
@@ -109,8 +289,10 @@ class ClimatologicalAnalyzer:
         Returns:
             Probability of comfortable conditions
         """
-        comfortable_count = np.sum((self.data >= min_comfortable) & 
-                                   (self.data <= max_comfortable))
+        if math.isnan(min_comfortable) or math.isnan(max_comfortable):
+            return 0.0
+        count_between = _count_between_numba if self.engine == 'numba' else _count_between_kernel
+        comfortable_count = count_between(self._sorted, float(min_comfortable), float(max_comfortable))
         return comfortable_count / self.n_years
     
     def calculate_return_period(self, threshold: float, condition: str = 'exceeds') -> float:
@@ -140,14 +322,11 @@ class ClimatologicalAnalyzer:
             # Fit Gumbel distribution to annual maxima
             params = stats.gumbel_r.fit(self.data)
             
-            # Calculate return values for different periods
-            return_periods = [2, 5, 10, 20, 50, 100]
-            return_values = {}
-            
-            for period in return_periods:
-                probability = 1 - (1 / period)
-                return_value = stats.gumbel_r.ppf(probability, *params)
-                return_values[f'{period}_year'] = return_value
+            # Calculate return values for all periods in one vectorized call
+            probabilities = 1 - 1 / np.array(RETURN_PERIODS)
+            values = stats.gumbel_r.ppf(probabilities, *params)
+            return_values = {f'{period}_year': value 
+                             for period, value in zip(RETURN_PERIODS, values)}
             
             return {
                 'distribution_params': params,
@@ -161,58 +340,60 @@ class ClimatologicalAnalyzer:
         """Calculate goodness of fit for Gumbel distribution."""
         try:
             # Kolmogorov-Smirnov test
-            ks_stat, ks_p_value = stats.kstest(self.data, 
-                                             lambda x: stats.gumbel_r.cdf(x, *params))
+            ks_stat, ks_p_value = stats.kstest(self.data, 'gumbel_r', args=params)
             
             return {
                 'ks_statistic': ks_stat,
-                'ks_p_value': ks_p_value,
+                'ks_p_value': float(ks_p_value),
                 'fit_quality': 'good' if ks_p_value > 0.05 else 'poor'
             }
         except:
             return {'fit_quality': 'unknown'}
     
-    def generate_risk_assessment(self, thresholds: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_risk_assessment(self, thresholds: Union[ParamThresholds, Mapping[str, Any]]) -> Dict[str, Any]:
         """
         Generate comprehensive risk assessment.
         
         Args:
-            thresholds: Dictionary with 'hot', 'cold', 'comfortable' thresholds
+            thresholds: ParamThresholds, or a dictionary with 'hot', 'cold',
+                        'comfortable' thresholds
         
         Returns:
             Risk assessment dictionary
         """
         assessment = {
-            'basic_stats': {
-                'mean': np.mean(self.data),
-                'median': np.median(self.data),
-                'std_dev': np.std(self.data),
-                'min_recorded': np.min(self.data),
-                'max_recorded': np.max(self.data),
-                'data_years': self.n_years
-            },
+            'basic_stats': self.summary._asdict(),
             'percentiles': self.get_percentiles(),
             'trend_analysis': self.detect_trend()
         }
         
         # Add threshold-based probabilities if thresholds provided
         if thresholds:
-            if 'hot' in thresholds:
-                assessment['very_hot_probability'] = self.calculate_probability(
-                    thresholds['hot'], 'exceeds')
-                assessment['hot_return_period'] = self.calculate_return_period(
-                    thresholds['hot'], 'exceeds')
+            if not isinstance(thresholds, ParamThresholds):
+                thresholds = ParamThresholds.from_mapping(thresholds)
+            n = self.n_years
+            
+            # Batch every threshold into two binary searches over the sorted data:
+            # upper bounds count from the right, lower bounds from the left
+            upper = np.searchsorted(self._sorted, [thresholds.hot, thresholds.comfort_max],
+                                    side='right')
+            lower = np.searchsorted(self._sorted, [thresholds.cold, thresholds.comfort_min],
+                                    side='left')
+            
+            if not math.isnan(thresholds.hot):
+                hot_probability = (n - upper[0]) / n
+                assessment['very_hot_probability'] = hot_probability
+                assessment['hot_return_period'] = (
+                    1 / hot_probability if hot_probability else float('inf'))
             
-            if 'cold' in thresholds:
-                assessment['very_cold_probability'] = self.calculate_probability(
-                    thresholds['cold'], 'below')
-                assessment['cold_return_period'] = self.calculate_return_period(
-                    thresholds['cold'], 'below')
+            if not math.isnan(thresholds.cold):
+                cold_probability = lower[0] / n
+                assessment['very_cold_probability'] = cold_probability
+                assessment['cold_return_period'] = (
+                    1 / cold_probability if cold_probability else float('inf'))
             
-            if 'comfortable' in thresholds:
-                comfort = thresholds['comfortable']
-                assessment['comfortable_probability'] = self.get_comfortable_probability(
-                    comfort['min'], comfort['max'])
+            if not (math.isnan(thresholds.comfort_min) or math.isnan(thresholds.comfort_max)):
+                assessment['comfortable_probability'] = max(upper[1] - lower[1], 0) / n
         
         # Add extreme value analysis
         assessment['extreme_values'] = self.get_extreme_value_analysis()
@@ -222,6 +403,12 @@ class ClimatologicalAnalyzer:
         
         return assessment
     
+    def _basic_stats(self) -> Tuple[float, float, float, float]:
+        """Mean, standard deviation, minimum and maximum using the selected engine."""
+        if self.engine == 'numba':
+            return _basic_stats_numba(self.data)
+        return np.mean(self.data), np.std(self.data), np.min(self.data), np.max(self.data)
+    
     def _categorize_risk(self, assessment: Dict[str, Any]) -> str:
         """Categorize overall risk level based on assessment."""
         try:
@@ -257,28 +444,17 @@ class ClimatologicalAnalyzer:
             return {}
         
         try:
-            df = pd.DataFrame({
-                'value': self.data,
-                'date': pd.to_datetime(dates)
-            })
-            
-            df['month'] = df['date'].dt.month
-            monthly_stats = {}
+            months = pd.to_datetime(dates).month
             
-            for month in range(1, 13):
-                month_data = df[df['month'] == month]['value']
-                if len(month_data) > 0:
-                    monthly_stats[month] = {
-                        'mean': month_data.mean(),
-                        'std': month_data.std(),
-                        'min': month_data.min(),
-                        'max': month_data.max(),
-                        'count': len(month_data)
-                    }
+            # All monthly aggregates in one grouped pass
+            agg = pd.Series(self.data).groupby(np.asarray(months)).agg(
+                ['mean', 'std', 'min', 'max', 'count'])
+            monthly_stats = {int(month): stats_row 
+                             for month, stats_row in agg.to_dict('index').items()}
             
             return monthly_stats
         except Exception as e:
-            print(f"Error calculating monthly statistics: {e}")
+            logger.warning("Error calculating monthly statistics: %s", e)
             return {}
     
     def confidence_interval(self, confidence_level: float = 0.95) -> Tuple[float, float]:
@@ -291,16 +467,9 @@ class ClimatologicalAnalyzer:
         Returns:
             Tuple of (lower_bound, upper_bound)
         """
-        alpha = 1 - confidence_level
-        mean = np.mean(self.data)
-        std_err = stats.sem(self.data)  # Standard error of mean
-        
-        # Use t-distribution for small samples
-        if self.n_years < 30:
-            t_val = stats.t.ppf(1 - alpha/2, self.n_years - 1)
-            margin_error = t_val * std_err
-        else:
-            z_val = stats.norm.ppf(1 - alpha/2)
-            margin_error = z_val * std_err
+        mean = self.summary.mean
+        # Standard error of mean (ddof=1) from the cached population std
+        std_err = self.summary.std_dev / np.sqrt(self.n_years - 1)
+        margin_error = _critical_value(confidence_level, self.n_years) * std_err
         
         return (mean - margin_error, mean + margin_error)
\ No newline at end of file
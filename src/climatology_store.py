@@ -0,0 +1,102 @@
+"""
+Local store of precomputed climatology, read before falling back to the API.
+
+Daily historical series are written by build_climatology.py as Parquet files
+partitioned by parameter and location:
+
+    climatology/param=<parameter>/lat=<lat>/lon=<lon>/data.parquet
+
+Each file holds 'year', 'doy' and 'value' columns for one parameter at one
+location, so a query only reads the rows for its day of year.
+"""
+
+import functools
+import math
+import os
+from datetime import datetime
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+try:
+    from config import CLIMATOLOGY_CONFIG
+except ImportError:
+    # Fallback if config not available
+    CLIMATOLOGY_CONFIG = {'enabled': False}
+
+try:
+    import pyarrow  # noqa: F401  (Parquet engine for pandas)
+except ImportError:
+    # Optional: only needed to read or build the precomputed climatology
+    pyarrow = None
+
+
+def partition_path(lat: float, lon: float, parameter: str, root: str = None) -> str:
+    """
+    Path of the Parquet file holding one parameter's series at one location.
+    
+    Args:
+        lat: Latitude (rounded to 2 decimals for the partition key)
+        lon: Longitude (rounded to 2 decimals for the partition key)
+        parameter: Weather parameter (e.g., 't_2m:C')
+        root: Store directory (defaults to CLIMATOLOGY_CONFIG['path'])
+    
+    Returns:
+        File path of the partition
+    """
+    root = root or CLIMATOLOGY_CONFIG['path']
+    # ':' is not allowed in Windows paths
+    param_dir = parameter.replace(':', '_')
+    return os.path.join(root, f'param={param_dir}', f'lat={round(lat, 2):.2f}',
+                        f'lon={round(lon, 2):.2f}', 'data.parquet')
+
+
+@functools.lru_cache(maxsize=128)
+def _read_partition(path: str, mtime: float) -> pd.DataFrame:
+    """Read a partition once per version of the file, indexed by day of year with years in order."""
+    df = pd.read_parquet(path, columns=['year', 'doy', 'value'])
+    return df.sort_values(['doy', 'year']).set_index('doy')
+
+
+def load_historical_data(lat: float, lon: float, parameter: str,
+                         day_of_year: int, years_back: int = 30) -> Optional[np.ndarray]:
+    """
+    Get historical values for a day of year from the precomputed climatology.
+    
+    Args:
+        lat: Latitude
+        lon: Longitude
+        parameter: Weather parameter
+        day_of_year: Day of year (1-366)
+        years_back: Number of years to look back
+    
+    Returns:
+        float32 array of historical values, or None if the store cannot answer the query
+    """
+    if pyarrow is None or not CLIMATOLOGY_CONFIG.get('enabled'):
+        return None
+    
+    path = partition_path(lat, lon, parameter)
+    try:
+        # The modification time is part of the cache key, so a rebuilt store is picked up
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    
+    try:
+        rows = _read_partition(path, mtime).loc[[day_of_year]]
+    except KeyError:
+        return None
+    
+    # Same window as a live query: the years_back years before the current one
+    current_year = datetime.now().year
+    in_window = rows['year'].between(current_year - years_back, current_year - 1)
+    values = rows.loc[in_window, 'value'].dropna().to_numpy(dtype=np.float32)
+    
+    # A store built for fewer years than requested must not stand in for the
+    # full window; the live fetch's minimum of 5 values applies as well
+    required = max(5, math.ceil(CLIMATOLOGY_CONFIG.get('min_coverage', 1.0) * years_back))
+    if len(values) < required:
+        return None
+    return values
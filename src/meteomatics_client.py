@@ -3,18 +3,21 @@ Meteomatics API Client for climatological data retrieval.
 """
 
 import meteomatics.api as mtm
+from meteomatics.exceptions import API_EXCEPTIONS, BadRequest, Forbidden, NotFound, UriTooLong
+import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, ClassVar, Set
 import warnings
-import sys
-import os
+import io
+import functools
+import hashlib
+import logging
 
-# Add parent directory to path for config import
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 try:
-    from config import get_meteomatics_credentials, is_api_valid, get_api_status
+    from config import get_meteomatics_credentials, is_api_valid, get_api_status, CACHE_CONFIG
 except ImportError:
     # Fallback if config not available
     def get_meteomatics_credentials():
@@ -23,11 +26,55 @@ except ImportError:
         return False
     def get_api_status():
         return {"username": "demo", "valid_until": "N/A", "is_valid": False}
+    CACHE_CONFIG = {'enabled': False}
+
+logger = logging.getLogger(__name__)
+
+try:
+    import diskcache
+except ImportError:
+    # Optional: only needed for the persistent historical data cache
+    diskcache = None
+
+# Time series at a comma-separated list of timestamps for one coordinate
+TIME_LIST_URL_TEMPLATE = '{base_url}/{dates}/{parameters}/{lat},{lon}/csv?model=mix'
+
+# Same request timeout as meteomatics.api.query_api
+QUERY_TIMEOUT_SECONDS = 330
+
+# Client errors where one rejected parameter (or an over-long URL) fails the
+# whole combined request, so fetching parameters one at a time can still succeed
+PER_PARAMETER_RETRY_ERRORS = (BadRequest, Forbidden, NotFound, UriTooLong)
+
+# Shared generator for unseeded mock data (PCG64, thread-safe, no global state)
+_RNG = np.random.default_rng()
+
+# Seasonal temperature swing for mock data, indexed by day of year - 1
+_SEASONAL_CYCLE = (10 * np.sin(2 * np.pi * np.arange(366) / 365.25)).astype(np.float32)
+
+
+@functools.lru_cache(maxsize=None)
+def _disk_cache():
+    """Shared on-disk cache for real historical data, or None if unavailable or disabled."""
+    if diskcache is None or not CACHE_CONFIG.get('enabled') or 'disk_cache_dir' not in CACHE_CONFIG:
+        return None
+    return diskcache.Cache(CACHE_CONFIG['disk_cache_dir'], 
+                           size_limit=CACHE_CONFIG.get('disk_size_limit', 2 ** 30))
+
+
+@functools.lru_cache(maxsize=32)
+def _daily_range(start_date: datetime, end_date: datetime) -> pd.DatetimeIndex:
+    """Daily index between two dates, cached since mock requests repeat the same spans."""
+    return pd.date_range(start_date, end_date, freq='D')
 
 
 class MeteomaticsClient:
     """Client for accessing Meteomatics weather API for climatological analysis."""
     
+    # (username, password digest) pairs already proven by a real request; the
+    # password is part of the key so a wrong one is never taken as validated
+    _validated_users: ClassVar[Set[Tuple[str, str]]] = set()
+    
     def __init__(self, username: str = None, password: str = None):
         """
         Initialize the Meteomatics client.
@@ -39,39 +86,69 @@ class MeteomaticsClient:
         if username is None or password is None:
             # Use credentials from config
             self.username, self.password = get_meteomatics_credentials()
-            print(f"🔑 Using configured API credentials for user: {self.username}")
+            logger.info("Using configured API credentials for user: %s", self.username)
             
             # Check if credentials are still valid
             api_status = get_api_status()
             if api_status['is_valid']:
                 days_remaining = api_status['days_remaining']
-                print(f"✅ API credentials valid until {api_status['valid_until']} ({days_remaining} days remaining)")
+                logger.info("API credentials valid until %s (%s days remaining)", 
+                            api_status['valid_until'], days_remaining)
             else:
-                print("⚠️ API credentials may be expired or invalid")
+                logger.warning("API credentials may be expired or invalid")
         else:
             self.username = username
             self.password = password
-            print(f"🔑 Using provided API credentials for user: {username}")
+            logger.info("Using provided API credentials for user: %s", username)
         
-        self._validate_credentials()
+        # One pooled HTTPS session per client, so repeated queries reuse connections.
+        # A query fetches sequentially (one bulk request, or one per parameter on
+        # fallback), so concurrent requests only come from Streamlit sessions
+        # sharing this client: one host, a few connections. SSL/proxy settings
+        # follow meteomatics' Config like its own requests do
+        self._session = requests.Session()
+        self._session.auth = (self.username, self.password)
+        self._session.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self._get = mtm.handle_ssl(mtm.handle_proxy(self._session.get))
+        self._credentials_key = (self.username, 
+                                 hashlib.sha256(self.password.encode()).hexdigest())
+        
+        # Credentials are checked lazily: a successful query marks the user as
+        # validated, and validate() is available for an eager check.
     
-    def _validate_credentials(self):
-        """Validate API credentials by making a test request."""
+    def validate(self) -> bool:
+        """
+        Validate API credentials by making a test request.
+        
+        The check runs at most once per set of credentials per process; later
+        calls with already validated credentials return immediately.
+        
+        Returns:
+            True if the credentials are known to work, False otherwise
+        """
+        if self._credentials_key in MeteomaticsClient._validated_users:
+            return True
+        
         try:
             # Test with a small request
             test_coords = [(0, 0)]
             test_date = datetime.now()
             mtm.query_time_series(
-                [test_date], 
-                ['t_2m:C'], 
-                test_coords, 
-                self.username, 
+                test_coords,
+                test_date,
+                test_date,
+                timedelta(hours=1),
+                ['t_2m:C'],
+                self.username,
                 self.password,
                 model='mix'
             )
-            print("✓ Meteomatics API credentials validated successfully")
+            MeteomaticsClient._validated_users.add(self._credentials_key)
+            logger.info("Meteomatics API credentials validated successfully")
+            return True
         except Exception as e:
             warnings.warn(f"Could not validate credentials: {e}")
+            return False
     
     def get_climatology(self, lat: float, lon: float, parameter: str, 
                        start_date: datetime, end_date: datetime) -> pd.DataFrame:
@@ -86,25 +163,28 @@ class MeteomaticsClient:
             end_date: End date
         
         Returns:
-            DataFrame with historical data
+            DataFrame with daily historical data
         """
         coordinates = [(lat, lon)]
         
         try:
             # Fetch data
             df = mtm.query_time_series(
-                [start_date, end_date],
-                [parameter],
                 coordinates,
+                start_date,
+                end_date,
+                timedelta(days=1),
+                [parameter],
                 self.username,
                 self.password,
                 model='mix'
             )
+            MeteomaticsClient._validated_users.add(self._credentials_key)
             
             return df
             
         except Exception as e:
-            print(f"Error fetching data: {e}")
+            logger.warning("Error fetching data: %s", e)
             # Return mock data for development/testing
             return self._generate_mock_data(start_date, end_date, parameter)
     
@@ -121,78 +201,179 @@ class MeteomaticsClient:
             years_back: Number of years to look back
         
         Returns:
-            Array of historical values
+            float32 array of historical values
+        """
+        return self.get_historical_data_bulk(lat, lon, [parameter], 
+                                             day_of_year, years_back)[parameter]
+    
+    def get_historical_data_bulk(self, lat: float, lon: float, parameters: List[str], 
+                                 day_of_year: int, years_back: int = 30) -> Dict[str, np.ndarray]:
+        """
+        Get historical data for several parameters at once.
+        
+        All parameters and all years are fetched in a single request, using
+        the API's comma-separated parameter and timestamp list syntax.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            parameters: Weather parameters
+            day_of_year: Day of year (1-365)
+            years_back: Number of years to look back
+        
+        Returns:
+            Dictionary mapping each parameter to its float32 array of historical values
         """
+        parameters = list(dict.fromkeys(parameters))
         current_year = datetime.now().year
-        historical_data = []
+        # Same day of year in every past year, built as one datetime64 vector
+        years = np.arange(str(current_year - years_back), str(current_year), dtype='datetime64[Y]')
+        dates = years.astype('datetime64[D]') + np.timedelta64(day_of_year - 1, 'D')
+        dates = dates.astype('datetime64[s]').astype(object).tolist()
+        
+        # Real data cached on disk by an earlier query; mock data is never cached
+        cache = _disk_cache()
+        cache_keys = {param: (round(lat, 2), round(lon, 2), param, day_of_year, 
+                              years_back, current_year)
+                      for param in parameters}
+        historical_data = {}
+        if cache is not None:
+            for param in parameters:
+                cached = cache.get(cache_keys[param])
+                if cached is not None:
+                    historical_data[param] = np.asarray(cached, dtype=np.float32)
+        
+        to_fetch = [param for param in parameters if param not in historical_data]
+        if not to_fetch:
+            return historical_data
+        
+        try:
+            df = self._query_dates(lat, lon, to_fetch, dates)
+        except PER_PARAMETER_RETRY_ERRORS as e:
+            logger.info("Combined request rejected (%s), fetching parameters individually", 
+                        type(e).__name__)
+            df = self._query_dates_per_parameter(lat, lon, to_fetch, dates)
+        except Exception as e:
+            logger.warning("Error fetching historical data: %s", e)
+            df = pd.DataFrame()
+        
+        for param in to_fetch:
+            if param in df.columns:
+                values = df[param].dropna().to_numpy(dtype=np.float32)
+            else:
+                values = np.empty(0, dtype=np.float32)
+            
+            # If no real data available, generate mock data
+            if values.size < 5:
+                values = self._generate_mock_historical_data(param, years_back)
+            elif cache is not None:
+                cache.set(cache_keys[param], values, 
+                          expire=CACHE_CONFIG.get('disk_ttl_seconds'))
+            historical_data[param] = values
+        
+        # Keep the requested parameter order
+        return {param: historical_data[param] for param in parameters}
+    
+    def _query_dates(self, lat: float, lon: float, parameters: List[str], 
+                     dates: List[datetime]) -> pd.DataFrame:
+        """
+        Fetch parameters at an explicit list of timestamps in one request.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            parameters: Weather parameters
+            dates: Timestamps to query (interpreted as UTC)
+        
+        Returns:
+            DataFrame indexed by timestamp with one column per parameter
+        """
+        url = TIME_LIST_URL_TEMPLATE.format(
+            base_url=mtm.DEFAULT_API_BASE_URL,
+            dates=','.join(date.strftime('%Y-%m-%dT%H:%M:%SZ') for date in dates),
+            parameters=','.join(parameters),
+            lat=lat,
+            lon=lon
+        )
+        response = self._get(url, timeout=QUERY_TIMEOUT_SECONDS, headers={'Accept': 'text/csv'})
+        if response.status_code != requests.codes.ok:
+            raise API_EXCEPTIONS[response.status_code](response.text)
+        MeteomaticsClient._validated_users.add(self._credentials_key)
+        
+        return pd.read_csv(io.StringIO(response.text), sep=';', index_col=0, 
+                           na_values=mtm.NA_VALUES)
+    
+    def _query_dates_per_parameter(self, lat: float, lon: float, parameters: List[str], 
+                                   dates: List[datetime]) -> pd.DataFrame:
+        """
+        Fetch each parameter in its own request, skipping those that fail.
+        
+        Args:
+            lat: Latitude
+            lon: Longitude
+            parameters: Weather parameters
+            dates: Timestamps to query (interpreted as UTC)
         
-        for year in range(current_year - years_back, current_year):
+        Returns:
+            DataFrame with one column per successfully fetched parameter
+        """
+        frames = []
+        for param in parameters:
             try:
-                # Create date for this year
-                date = datetime(year, 1, 1) + timedelta(days=day_of_year - 1)
-                
-                # Fetch single day data
-                df = self.get_climatology(lat, lon, parameter, date, date)
-                
-                if not df.empty:
-                    value = df.iloc[0, 0] if len(df) > 0 else np.nan
-                    if not np.isnan(value):
-                        historical_data.append(value)
-                        
+                frames.append(self._query_dates(lat, lon, [param], dates))
             except Exception as e:
-                print(f"Error fetching data for year {year}: {e}")
-                continue
-        
-        # If no real data available, generate mock data
-        if len(historical_data) < 5:
-            historical_data = self._generate_mock_historical_data(parameter, years_back)
+                logger.warning("Error fetching historical data for %s: %s", param, e)
         
-        return np.array(historical_data)
+        return pd.concat(frames, axis=1) if frames else pd.DataFrame()
     
     def _generate_mock_data(self, start_date: datetime, end_date: datetime, 
                            parameter: str) -> pd.DataFrame:
         """Generate mock data for testing when API is not available."""
-        date_range = pd.date_range(start_date, end_date, freq='D')
+        date_range = _daily_range(start_date, end_date)
+        n = len(date_range)
         
-        # Parameter-specific mock data generation
+        # Parameter-specific mock data generation, as float32 (ample for mock values)
         if 't_2m' in parameter:  # Temperature
+            # base + seasonal variation + noise, built in place in one buffer
             base_temp = 20
-            seasonal_variation = 10 * np.sin(2 * np.pi * np.arange(len(date_range)) / 365.25)
-            noise = np.random.normal(0, 3, len(date_range))
-            values = base_temp + seasonal_variation + noise
+            values = _SEASONAL_CYCLE[date_range.dayofyear.values - 1]
+            values += base_temp
+            noise = _RNG.standard_normal(n, dtype=np.float32)
+            noise *= 3
+            values += noise
         elif 'precip' in parameter:  # Precipitation
-            values = np.random.exponential(2, len(date_range))
+            values = _RNG.standard_exponential(n, dtype=np.float32)
+            values *= 2
         elif 'wind' in parameter:  # Wind speed
-            values = np.random.gamma(2, 5, len(date_range))
+            values = _RNG.standard_gamma(2, n, dtype=np.float32)
+            values *= 5
         else:
-            values = np.random.normal(0, 1, len(date_range))
+            values = _RNG.standard_normal(n, dtype=np.float32)
         
-        # Create DataFrame similar to Meteomatics format
+        # Create DataFrame similar to Meteomatics format, wrapping values without a copy
         df = pd.DataFrame({
             parameter: values
-        }, index=date_range)
+        }, index=date_range, copy=False)
         
         return df
     
-    def _generate_mock_historical_data(self, parameter: str, years: int) -> List[float]:
+    def _generate_mock_historical_data(self, parameter: str, years: int) -> np.ndarray:
         """Generate mock historical data for testing."""
-        np.random.seed(42)  # For reproducible results
+        # Seeded per call for reproducible results without touching np.random's global state
+        rng = np.random.default_rng(42)
         
         if 't_2m' in parameter:  # Temperature
-            # Simulate temperature with seasonal and random variation
+            # Simulate temperature with random variation around a base value
             base_temp = 20
-            historical_data = []
-            for _ in range(years):
-                temp = base_temp + np.random.normal(0, 5)
-                historical_data.append(temp)
+            historical_data = base_temp + rng.normal(0, 5, years)
         elif 'precip' in parameter:  # Precipitation
-            historical_data = list(np.random.exponential(5, years))
+            historical_data = rng.exponential(5, years)
         elif 'wind' in parameter:  # Wind speed
-            historical_data = list(np.random.gamma(3, 4, years))
+            historical_data = rng.gamma(3, 4, years)
         else:
-            historical_data = list(np.random.normal(0, 1, years))
+            historical_data = rng.normal(0, 1, years)
         
-        return historical_data
+        return historical_data.astype(np.float32)
     
     def get_available_parameters(self) -> Dict[str, str]:
         """
@@ -2,127 +2,409 @@
 Weather query processor for handling user requests and coordinating analysis.
 """
 
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from datetime import datetime, timedelta, date as date_type
+import bisect
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+from collections import Counter
+from itertools import islice
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple, Union
 import json
 import os
-import sys
+import functools
+import logging
+import multiprocessing
+import threading
+import numpy as np
 
-# Add parent directory to path for config import
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from src.meteomatics_client import MeteomaticsClient
-from src.climatological_analyzer import ClimatologicalAnalyzer
+from .meteomatics_client import MeteomaticsClient
+from .climatological_analyzer import ClimatologicalAnalyzer, ParamThresholds, warmup_numba
+from .climatology_store import load_historical_data
 
 try:
-    from config import PARAMETER_THRESHOLDS, DEFAULT_LOCATIONS, get_meteomatics_credentials
+    from config import PARAMETER_THRESHOLDS, DEFAULT_LOCATIONS, CACHE_CONFIG, get_meteomatics_credentials
 except ImportError:
     # Fallback if config not available
     PARAMETER_THRESHOLDS = {}
     DEFAULT_LOCATIONS = []
+    CACHE_CONFIG = {'enabled': True, 'ttl_seconds': 3600, 'max_size': 100}
     def get_meteomatics_credentials():
         return "demo", "demo"
 
+logger = logging.getLogger(__name__)
+
+# Parameter count from which the statistics run in worker processes (when the
+# processor enables them); below this, transfer costs more than the analysis
+PROCESS_POOL_MIN_PARAMETERS = 4
+
+# Human-readable parameter descriptions (read-only)
+PARAMETER_DESCRIPTIONS = MappingProxyType({
+    't_2m:C': 'Temperature at 2 meters above ground',
+    't_max_2m_24h:C': 'Maximum temperature in 24 hours',
+    't_min_2m_24h:C': 'Minimum temperature in 24 hours',
+    'precip_24h:mm': 'Precipitation in 24 hours',
+    'wind_speed_10m:ms': 'Wind speed at 10 meters height',
+    'wind_gusts_10m_24h:ms': 'Maximum wind gusts in 24 hours',
+    'relative_humidity_2m:p': 'Relative humidity at 2 meters',
+    'msl_pressure:hPa': 'Mean sea level pressure',
+    'sunshine_duration_24h:h': 'Sunshine duration in 24 hours'
+})
+
+# Variability wording by coefficient of variation: < 0.1, < 0.2, < 0.3, otherwise
+VARIABILITY_CV_BINS = (0.1, 0.2, 0.3)
+VARIABILITY_LABELS = (
+    'Very consistent conditions',
+    'Fairly consistent conditions',
+    'Moderate variability',
+    'High variability'
+)
+
+# (parameter key, low, high, labels for mean below low / within / above high)
+TYPICAL_CONDITIONS = (
+    ('t_2m', 10, 25, ('Typically cold conditions', 'Typically mild conditions', 
+                      'Typically warm conditions')),
+    ('precip', 1, 10, ('Typically dry conditions', 'Typically moderate precipitation', 
+                       'Typically wet conditions')),
+    ('wind', 15, 30, ('Typically calm conditions', 'Typically moderate wind', 
+                      'Typically windy conditions'))
+)
+
+
+def _parse_query_date(value: Union[str, date_type]) -> datetime:
+    """
+    Parse a query date given as a 'YYYY-MM-DD' string or a date/datetime.
+    
+    Args:
+        value: Date string or date object
+    
+    Returns:
+        The date as a datetime
+    """
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date_type):
+        return datetime(value.year, value.month, value.day)
+    try:
+        # fromisoformat is a C fast path for the canonical layout; it also takes
+        # other ISO 8601 forms (e.g. '20250704'), so only that layout goes to it
+        if len(value) == 10 and value[4] == '-' and value[7] == '-':
+            try:
+                parsed = date_type.fromisoformat(value)
+                return datetime(parsed.year, parsed.month, parsed.day)
+            except ValueError:
+                pass
+        # Everything else strptime accepts, e.g. non-padded '2025-7-4'
+        return datetime.strptime(value, '%Y-%m-%d')
+    except (ValueError, TypeError):
+        raise ValueError("Date must be in format YYYY-MM-DD")
+
+
+@functools.lru_cache(maxsize=64)
+def _param_key(parameter: str) -> str:
+    """Normalized parameter name used for lookups (e.g. 't_2m:C' -> 't_2m')."""
+    return parameter.split(':')[0].lower()
+
+
+def _assess(historical_data: np.ndarray, thresholds: Optional[ParamThresholds]) -> Dict[str, Any]:
+    """
+    Risk assessment of one parameter's historical values.
+    
+    Args:
+        historical_data: Historical values
+        thresholds: Thresholds for the parameter
+    
+    Returns:
+        Assessment dictionary, or a dictionary with an 'error' entry
+    """
+    try:
+        # Perform analysis
+        if historical_data.size > 0:
+            analyzer = ClimatologicalAnalyzer(historical_data)
+            return analyzer.generate_risk_assessment(thresholds)
+        else:
+            return {
+                'error': 'No historical data available'
+            }
+    
+    except Exception as e:
+        return {
+            'error': str(e)
+        }
+
+
+def _assess_shared(task: Tuple[str, str, Tuple[int, ...], Optional[ParamThresholds]]) -> Dict[str, Any]:
+    """Process pool worker: _assess on a series held in a shared memory block."""
+    name, dtype, shape, thresholds = task
+    block = SharedMemory(name=name)
+    try:
+        # The view only lives inside _assess, so the block can be closed after it
+        return _assess(np.ndarray(shape, dtype=dtype, buffer=block.buf), thresholds)
+    finally:
+        block.close()
+
 
 class WeatherQueryProcessor:
     """Processor for handling weather queries and coordinating analysis."""
     
-    def __init__(self, meteomatics_username: str = None, meteomatics_password: str = None):
+    def __init__(self, meteomatics_username: str = None, meteomatics_password: str = None,
+                 use_process_pool: bool = False):
         """
         Initialize the query processor.
         
         Args:
             meteomatics_username: Meteomatics API username (optional, will use config if not provided)
             meteomatics_password: Meteomatics API password (optional, will use config if not provided)
+            use_process_pool: Analyze batches of PROCESS_POOL_MIN_PARAMETERS or more
+                              parameters in worker processes. Only for long-running
+                              callers (e.g. the Streamlit app): workers are spawned,
+                              so the calling script must guard its top level with
+                              if __name__ == '__main__'.
         """
         if meteomatics_username is None and meteomatics_password is None:
             # Use credentials from config
             self.data_client = MeteomaticsClient()
-            print("🔧 Initialized with configured API credentials")
+            logger.info("Initialized with configured API credentials")
         else:
             # Use provided credentials
             self.data_client = MeteomaticsClient(meteomatics_username, meteomatics_password)
         
         self.parameter_thresholds = PARAMETER_THRESHOLDS
+        # Resolved once into the analyzer's compact, immutable form
+        self._thresholds = MappingProxyType({
+            key: ParamThresholds.from_mapping(value)
+            for key, value in PARAMETER_THRESHOLDS.items()
+        })
+        self.refresh_parameters()
+        
+        # Worker processes, started on first use when enabled
+        self.use_process_pool = use_process_pool
+        self._process_pool = None
+        self._process_pool_size = 0
+        self._process_pool_lock = threading.Lock()
+        
+        # Lowercased name and country per location, built once for autocomplete
+        self._location_index = [
+            (loc['name'].lower(), loc['country'].lower(), loc) 
+            for loc in DEFAULT_LOCATIONS
+        ]
     
-    def process_query(self, location: Dict[str, float], date: str, 
+    def refresh_parameters(self) -> None:
+        """Reload the set of parameter codes accepted by validate_inputs from the client."""
+        self._available_params = frozenset(self.data_client.get_available_parameters())
+    
+    def process_query(self, location: Dict[str, float], date: Union[str, date_type], 
                      parameters: List[str], analysis_years: int = 30) -> Dict[str, Any]:
         """
         Process user query and return analysis.
         
         Args:
             location: Dict with 'lat' and 'lon'
-            date: Date string in format 'YYYY-MM-DD'
+            date: Date string in format 'YYYY-MM-DD', or an already parsed date
             parameters: List of weather parameters to analyze
             analysis_years: Number of years of historical data to analyze
         
         Returns:
             Complete analysis results
         """
+        # Convert date to day of year
+        query_date = _parse_query_date(date)
+        day_of_year = query_date.toordinal() - date_type(query_date.year, 1, 1).toordinal() + 1
+        
         results = {
             'location': location,
-            'query_date': date,
+            'query_date': date if isinstance(date, str) else query_date.strftime('%Y-%m-%d'),
             'analysis_years': analysis_years,
             'parameters': {}
         }
         
-        # Convert date to day of year
-        try:
-            query_date = datetime.strptime(date, '%Y-%m-%d')
-            day_of_year = query_date.timetuple().tm_yday
-        except ValueError:
-            raise ValueError("Date must be in format YYYY-MM-DD")
-        
-        # Process each parameter
+        # Use the precomputed climatology where available
+        all_historical_data = {}
         for param in parameters:
+            stored = load_historical_data(location['lat'], location['lon'], param, 
+                                          day_of_year, analysis_years)
+            if stored is not None:
+                all_historical_data[param] = stored
+        
+        # Fetch historical data for the remaining parameters in one batch
+        to_fetch = [param for param in parameters if param not in all_historical_data]
+        if to_fetch:
+            all_historical_data.update(self.data_client.get_historical_data_bulk(
+                location['lat'],
+                location['lon'],
+                to_fetch,
+                day_of_year,
+                analysis_years
+            ))
+        
+        # Analyze parameters concurrently; each one is independent and failures
+        # are caught per parameter so one never aborts the batch. With the process
+        # pool enabled, larger batches run the statistics in worker processes.
+        unique_params = list(dict.fromkeys(parameters))
+        analyzed = None
+        if self.use_process_pool and len(unique_params) >= PROCESS_POOL_MIN_PARAMETERS:
             try:
-                # Fetch historical data
-                historical_data = self.data_client.get_historical_data(
-                    location['lat'],
-                    location['lon'],
-                    param,
-                    day_of_year,
-                    analysis_years
-                )
-                
-                # Perform analysis
-                if len(historical_data) > 0:
-                    analyzer = ClimatologicalAnalyzer(historical_data)
-                    
-                    # Get thresholds for this parameter
-                    thresholds = self._get_thresholds(param)
-                    
-                    # Generate assessment
-                    assessment = analyzer.generate_risk_assessment(thresholds)
-                    
-                    # Add parameter-specific information
-                    assessment['parameter_info'] = {
-                        'code': param,
-                        'description': self._get_parameter_description(param),
-                        'units': self._get_parameter_units(param),
-                        'thresholds_used': thresholds
-                    }
-                    
-                    # Add interpretation
-                    assessment['interpretation'] = self._interpret_results(param, assessment)
-                    
-                    results['parameters'][param] = assessment
-                else:
-                    results['parameters'][param] = {
-                        'error': 'No historical data available'
-                    }
-                    
+                analyzed = self._analyze_in_processes(unique_params, all_historical_data)
             except Exception as e:
-                results['parameters'][param] = {
-                    'error': str(e)
-                }
+                logger.warning("Process pool unavailable (%s), analyzing in threads", e)
+                self._reset_process_pool()
+        if analyzed is None:
+            analyzed = self._analyze_in_threads(unique_params, all_historical_data)
+        
+        # Report parameters in the order they were requested
+        results['parameters'] = {param: analyzed[param] for param in unique_params}
         
         # Add overall summary
         results['summary'] = self._generate_summary(results)
         
         return results
     
-    def _get_thresholds(self, parameter: str) -> Dict[str, Any]:
+    def _analyze_in_threads(self, params: List[str], 
+                            all_historical_data: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze parameters on a thread pool.
+        
+        Args:
+            params: Unique weather parameter codes
+            all_historical_data: Historical values per parameter
+        
+        Returns:
+            Dictionary mapping each parameter to its assessment or error
+        """
+        analyzed = {}
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(params)))) as executor:
+            futures = [executor.submit(self._analyze_param, param, all_historical_data[param])
+                       for param in params]
+            for future in as_completed(futures):
+                param, assessment = future.result()
+                analyzed[param] = assessment
+        
+        return analyzed
+    
+    def _analyze_in_processes(self, params: List[str], 
+                              all_historical_data: Dict[str, np.ndarray]) -> Dict[str, Dict[str, Any]]:
+        """
+        Analyze parameters on the shared process pool.
+        
+        Each series is copied once into a shared memory block that the worker
+        maps directly, instead of being pickled to it.
+        
+        Args:
+            params: Unique weather parameter codes
+            all_historical_data: Historical values per parameter
+        
+        Returns:
+            Dictionary mapping each parameter to its assessment or error
+        """
+        analyzed = {}
+        blocks = {}
+        tasks = []
+        try:
+            for param in params:
+                data = np.ascontiguousarray(all_historical_data[param])
+                if data.size == 0:
+                    analyzed[param] = self._analyze_param(param, data)[1]
+                    continue
+                
+                block = SharedMemory(create=True, size=data.nbytes)
+                blocks[param] = block
+                np.ndarray(data.shape, dtype=data.dtype, buffer=block.buf)[...] = data
+                tasks.append((block.name, data.dtype.str, data.shape, self._get_thresholds(param)))
+            
+            pool = self._get_process_pool(len(tasks))
+            for param, assessment in zip(blocks, pool.map(_assess_shared, tasks)):
+                analyzed[param] = self._describe_assessment(param, assessment)
+        finally:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+        
+        return analyzed
+    
+    def _get_process_pool(self, n_tasks: int) -> ProcessPoolExecutor:
+        """
+        Get the worker pool, started or grown to fit a batch.
+        
+        Workers are capped at the batch size (and the CPU count); a larger
+        batch replaces the pool with a bigger one once its queued work is done.
+        
+        Args:
+            n_tasks: Number of parameters in the batch
+        
+        Returns:
+            Process pool with enough workers for the batch
+        """
+        workers = max(1, min(os.cpu_count() or 1, n_tasks))
+        with self._process_pool_lock:
+            if self._process_pool is None or self._process_pool_size < workers:
+                if self._process_pool is not None:
+                    self._process_pool.shutdown(wait=False)
+                # 'spawn' rather than fork: the Streamlit server process is
+                # multi-threaded. Each worker compiles the numba kernels first.
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=warmup_numba)
+                self._process_pool_size = workers
+            return self._process_pool
+    
+    def _reset_process_pool(self) -> None:
+        """Shut down the worker pool (e.g. after it broke) so the next use starts a new one."""
+        with self._process_pool_lock:
+            if self._process_pool is not None:
+                self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+            self._process_pool_size = 0
+    
+    def _analyze_param(self, param: str, 
+                       historical_data: np.ndarray) -> Tuple[str, Dict[str, Any]]:
+        """
+        Run the risk assessment for a single parameter.
+        
+        Args:
+            param: Weather parameter code
+            historical_data: Historical values for the parameter
+        
+        Returns:
+            Tuple of (parameter code, assessment or error dictionary)
+        """
+        assessment = _assess(historical_data, self._get_thresholds(param))
+        return param, self._describe_assessment(param, assessment)
+    
+    def _describe_assessment(self, param: str, assessment: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Add parameter information and interpretation to a raw assessment.
+        
+        Args:
+            param: Weather parameter code
+            assessment: Risk assessment, or an error dictionary
+        
+        Returns:
+            The completed assessment (error dictionaries are returned unchanged)
+        """
+        if 'error' in assessment:
+            return assessment
+        
+        try:
+            # Add parameter-specific information
+            assessment['parameter_info'] = {
+                'code': param,
+                'description': self._get_parameter_description(param),
+                'units': self._get_parameter_units(param),
+                'thresholds_used': self.parameter_thresholds.get(_param_key(param), {})
+            }
+            
+            # Add interpretation
+            assessment['interpretation'] = self._interpret_results(param, assessment)
+            
+            return assessment
+        
+        except Exception as e:
+            return {
+                'error': str(e)
+            }
+    
+    def _get_thresholds(self, parameter: str) -> Optional[ParamThresholds]:
         """
         Get standard thresholds for different parameters.
         
@@ -130,27 +412,13 @@ class WeatherQueryProcessor:
             parameter: Weather parameter code
         
         Returns:
-            Dictionary with threshold values
+            Threshold values, or None if the parameter has none configured
         """
-        # Normalize parameter name for lookup
-        param_key = parameter.split(':')[0].lower()
-        
-        return self.parameter_thresholds.get(param_key, {})
+        return self._thresholds.get(_param_key(parameter))
     
     def _get_parameter_description(self, parameter: str) -> str:
         """Get human-readable description of parameter."""
-        descriptions = {
-            't_2m:C': 'Temperature at 2 meters above ground',
-            't_max_2m_24h:C': 'Maximum temperature in 24 hours',
-            't_min_2m_24h:C': 'Minimum temperature in 24 hours',
-            'precip_24h:mm': 'Precipitation in 24 hours',
-            'wind_speed_10m:ms': 'Wind speed at 10 meters height',
-            'wind_gusts_10m_24h:ms': 'Maximum wind gusts in 24 hours',
-            'relative_humidity_2m:p': 'Relative humidity at 2 meters',
-            'msl_pressure:hPa': 'Mean sea level pressure',
-            'sunshine_duration_24h:h': 'Sunshine duration in 24 hours'
-        }
-        return descriptions.get(parameter, parameter)
+        return PARAMETER_DESCRIPTIONS.get(parameter, parameter)
     
     def _get_parameter_units(self, parameter: str) -> str:
         """Extract units from parameter code."""
@@ -174,18 +442,11 @@ class WeatherQueryProcessor:
         try:
             mean_val = assessment['basic_stats']['mean']
             std_val = assessment['basic_stats']['std_dev']
-            param_key = parameter.split(':')[0].lower()
+            param_key = _param_key(parameter)
             
             # Interpret variability
             cv = std_val / abs(mean_val) if mean_val != 0 else 0
-            if cv < 0.1:
-                interpretation['variability'] = 'Very consistent conditions'
-            elif cv < 0.2:
-                interpretation['variability'] = 'Fairly consistent conditions'
-            elif cv < 0.3:
-                interpretation['variability'] = 'Moderate variability'
-            else:
-                interpretation['variability'] = 'High variability'
+            interpretation['variability'] = VARIABILITY_LABELS[bisect.bisect_right(VARIABILITY_CV_BINS, cv)]
             
             # Interpret trend
             trend = assessment.get('trend_analysis', {})
@@ -195,35 +456,18 @@ class WeatherQueryProcessor:
             else:
                 interpretation['trend'] = 'No significant trend detected'
             
-            # Parameter-specific interpretations
-            if 't_2m' in param_key:
-                if mean_val < 10:
-                    interpretation['typical_conditions'] = 'Typically cold conditions'
-                elif mean_val > 25:
-                    interpretation['typical_conditions'] = 'Typically warm conditions'
-                else:
-                    interpretation['typical_conditions'] = 'Typically mild conditions'
-            
-            elif 'precip' in param_key:
-                if mean_val < 1:
-                    interpretation['typical_conditions'] = 'Typically dry conditions'
-                elif mean_val > 10:
-                    interpretation['typical_conditions'] = 'Typically wet conditions'
-                else:
-                    interpretation['typical_conditions'] = 'Typically moderate precipitation'
-            
-            elif 'wind' in param_key:
-                if mean_val < 15:
-                    interpretation['typical_conditions'] = 'Typically calm conditions'
-                elif mean_val > 30:
-                    interpretation['typical_conditions'] = 'Typically windy conditions'
-                else:
-                    interpretation['typical_conditions'] = 'Typically moderate wind'
+            # Parameter-specific interpretations (first matching key wins)
+            for key, low, high, labels in TYPICAL_CONDITIONS:
+                if key in param_key:
+                    # below low -> 0, within [low, high] -> 1, above high -> 2
+                    interpretation['typical_conditions'] = labels[
+                        int(not mean_val < low) + int(mean_val > high)]
+                    break
             
             # Risk level interpretation
             risk_category = assessment.get('risk_category', 'Unknown')
             interpretation['risk_level'] = f'Risk level: {risk_category}'
-            
+        
         except Exception as e:
             interpretation['error'] = f'Could not generate interpretation: {e}'
         
@@ -266,11 +510,8 @@ class WeatherQueryProcessor:
         
         # Determine overall risk
         if summary['overall_risk_levels']:
-            risk_counts = {}
-            for risk in summary['overall_risk_levels']:
-                risk_counts[risk] = risk_counts.get(risk, 0) + 1
-            
-            most_common_risk = max(risk_counts, key=risk_counts.get)
+            # Ties go to the level seen first
+            most_common_risk = Counter(summary['overall_risk_levels']).most_common(1)[0][0]
             summary['dominant_risk_level'] = most_common_risk
         
         return summary
@@ -289,13 +530,11 @@ class WeatherQueryProcessor:
         common_locations = DEFAULT_LOCATIONS
         
         if query:
-            # Simple filtering based on query
+            # Simple filtering based on query, stopping at the top 5 matches
             query_lower = query.lower()
-            suggestions = [
-                loc for loc in common_locations 
-                if query_lower in loc['name'].lower() or query_lower in loc['country'].lower()
-            ]
-            return suggestions[:5]  # Return top 5 matches
+            suggestions = (loc for name, country, loc in self._location_index 
+                           if query_lower in name or query_lower in country)
+            return list(islice(suggestions, 5))
         
         return common_locations[:5]  # Return top 5 if no query
     
@@ -312,6 +551,21 @@ class WeatherQueryProcessor:
         Returns:
             List of validation errors
         """
+        return self.parse_and_validate(location, date, parameters)[0]
+    
+    def parse_and_validate(self, location: Dict[str, float], date: Union[str, date_type], 
+                           parameters: List[str]) -> Tuple[List[str], Optional[datetime]]:
+        """
+        Validate user inputs, keeping the parsed date for process_query.
+        
+        Args:
+            location: Location dictionary
+            date: Date string in format 'YYYY-MM-DD', or a date
+            parameters: List of parameters
+        
+        Returns:
+            Tuple of (list of validation errors, parsed date or None if invalid)
+        """
         errors = []
         
         # Validate location
@@ -333,17 +587,78 @@ class WeatherQueryProcessor:
         
         # Validate date
         try:
-            datetime.strptime(date, '%Y-%m-%d')
-        except ValueError:
-            errors.append("Date must be in format YYYY-MM-DD")
+            query_date = _parse_query_date(date)
+        except ValueError as e:
+            query_date = None
+            errors.append(str(e))
         
         # Validate parameters
         if not parameters:
             errors.append("At least one parameter must be selected")
+        else:
+            for param in parameters:
+                if param not in self._available_params:
+                    errors.append(f"Unknown parameter: {param}")
         
-        available_params = self.data_client.get_available_parameters().keys()
-        for param in parameters:
-            if param not in available_params:
-                errors.append(f"Unknown parameter: {param}")
-        
-        return errors
\ No newline at end of file
+        return errors, query_date
+
+
+def _cache_query_results(func):
+    """
+    Cache results with Streamlit when it is installed, otherwise pass through.
+    
+    Streamlit is imported on the first call rather than at import time, so
+    scripts that never use the cache don't pay for (or hear from) it.
+    """
+    @functools.lru_cache(maxsize=None)
+    def target():
+        try:
+            import streamlit as st
+        except ImportError:
+            # Optional: without Streamlit the query simply runs
+            return func
+        return st.cache_data(show_spinner=False, ttl=CACHE_CONFIG['ttl_seconds'],
+                             max_entries=CACHE_CONFIG['max_size'])(func)
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return target()(*args, **kwargs)
+    
+    def clear():
+        # Nothing has been cached before the first call
+        if target.cache_info().currsize and target() is not func:
+            target().clear()
+    
+    wrapper.clear = clear
+    return wrapper
+
+
+@_cache_query_results
+def cached_process_query(_processor: WeatherQueryProcessor, username: str, password_digest: str,
+                         location: Tuple[float, float], date: Union[str, date_type],
+                         parameters: Tuple[str, ...], analysis_years: int = 30) -> Dict[str, Any]:
+    """
+    process_query with results cached on the (hashable) inputs.
+    
+    Streamlit reruns the whole script on every widget change; this makes a
+    rerun with unchanged inputs a cache lookup. The processor itself is not
+    hashed, so the username and a digest of the password are part of the
+    key to keep results fetched with different credentials apart. Call
+    cached_process_query.clear() to force fresh data.
+    
+    Args:
+        _processor: Query processor that runs the analysis
+        username: API username of the processor
+        password_digest: Digest of the processor's API password (e.g. SHA-256 hex)
+        location: (latitude, longitude) tuple
+        date: Target date (YYYY-MM-DD or date)
+        parameters: Tuple of weather parameters to analyze
+        analysis_years: Number of years of historical data to analyze
+    
+    Returns:
+        Dictionary with analysis results, as from process_query
+    """
+    lat, lon = location
+    return _processor.process_query(
+        {'lat': lat, 'lon': lon}, date, list(parameters), analysis_years
+    )
@@ -4,7 +4,6 @@ Quick launcher for the Climatological Probability Analysis application.
 
 import os
 import sys
-import subprocess
 
 def main():
     """Launch the application with configured credentials."""
@@ -45,6 +44,9 @@ def main():
     print("🌐 If not, navigate to: http://localhost:8501")
     print("\n" + "=" * 50)
     
+    # Only needed once the checks above have passed
+    import subprocess
+    
     try:
         # Launch Streamlit
         subprocess.run([sys.executable, "-m", "streamlit", "run", "app.py"], check=True)
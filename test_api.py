@@ -2,53 +2,53 @@
 Test script to validate Meteomatics API credentials.
 """
 
+import argparse
 import sys
-import os
 from datetime import datetime
-
-# Add src directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+from concurrent.futures import ThreadPoolExecutor
 
 try:
-    from config import get_meteomatics_credentials, get_api_status, is_api_valid
-    from src.meteomatics_client import MeteomaticsClient
-    from src.weather_query_processor import WeatherQueryProcessor
+    from config import get_meteomatics_credentials, get_api_status, is_api_valid, configure_logging
 except ImportError as e:
     print(f"Import error: {e}")
     print("Make sure all required packages are installed: pip install -r requirements.txt")
     sys.exit(1)
 
-def test_api_credentials():
-    """Test the API credentials and connection."""
+def test_api_credentials(log=print):
+    """Test the API credentials and connection, reporting through log."""
     
-    print("🧪 Testing Meteomatics API Connection")
-    print("=" * 50)
+    log("🧪 Testing Meteomatics API Connection")
+    log("=" * 50)
     
     # Check API status from config
     api_status = get_api_status()
-    print(f"📋 API Status Information:")
-    print(f"   Username: {api_status['username']}")
-    print(f"   Valid until: {api_status['valid_until']}")
-    print(f"   Is valid: {api_status['is_valid']}")
+    log(f"📋 API Status Information:")
+    log(f"   Username: {api_status['username']}")
+    log(f"   Valid until: {api_status['valid_until']}")
+    log(f"   Is valid: {api_status['is_valid']}")
     
     if 'days_remaining' in api_status:
         days_remaining = api_status['days_remaining']
-        print(f"   Days remaining: {days_remaining}")
+        log(f"   Days remaining: {days_remaining}")
         
         if days_remaining < 7:
-            print("   ⚠️  WARNING: API credentials expire soon!")
+            log("   ⚠️  WARNING: API credentials expire soon!")
         elif days_remaining < 0:
-            print("   ❌ ERROR: API credentials have expired!")
+            log("   ❌ ERROR: API credentials have expired!")
     
-    print("\n🔗 Testing API Connection...")
+    log("\n🔗 Testing API Connection...")
     
     try:
+        # Imported here so the launcher and config checks don't pay for numpy/pandas
+        from src.meteomatics_client import MeteomaticsClient
+        from src.weather_query_processor import WeatherQueryProcessor
+        
         # Initialize client with configured credentials
         client = MeteomaticsClient()
-        print("✅ Meteomatics client initialized successfully")
+        log("✅ Meteomatics client initialized successfully")
         
         # Test a simple query
-        print("\n🌡️ Testing weather data query...")
+        log("\n🌡️ Testing weather data query...")
         
         # Simple test: get current temperature for New York
         test_location = {'lat': 40.7128, 'lon': -74.0060}  # New York
@@ -68,33 +68,36 @@ def test_api_credentials():
             param_result = results['parameters']['t_2m:C']
             if 'error' not in param_result:
                 stats = param_result.get('basic_stats', {})
-                print(f"✅ API test successful!")
-                print(f"   Sample data: Mean temperature = {stats.get('mean', 'N/A'):.1f}°C")
-                print(f"   Data years: {stats.get('data_years', 'N/A')}")
+                log(f"✅ API test successful!")
+                log(f"   Sample data: Mean temperature = {stats.get('mean', 'N/A'):.1f}°C")
+                log(f"   Data years: {stats.get('data_years', 'N/A')}")
                 return True
             else:
-                print(f"❌ API returned error: {param_result['error']}")
+                log(f"❌ API returned error: {param_result['error']}")
                 return False
         else:
-            print("❌ Unexpected response format from API")
+            log("❌ Unexpected response format from API")
             return False
             
     except Exception as e:
-        print(f"❌ API test failed: {e}")
-        print("\n💡 Troubleshooting tips:")
-        print("   1. Check your internet connection")
-        print("   2. Verify your API credentials in config.py")
-        print("   3. Ensure your API subscription is active")
-        print("   4. Check if your IP is whitelisted (if required)")
+        log(f"❌ API test failed: {e}")
+        log("\n💡 Troubleshooting tips:")
+        log("   1. Check your internet connection")
+        log("   2. Verify your API credentials in config.py")
+        log("   3. Ensure your API subscription is active")
+        log("   4. Check if your IP is whitelisted (if required)")
         return False
 
-def test_demo_mode():
-    """Test the application in demo mode with mock data."""
+def test_demo_mode(log=print):
+    """Test the application in demo mode with mock data, reporting through log."""
     
-    print("\n🎭 Testing Demo Mode (Mock Data)")
-    print("=" * 50)
+    log("\n🎭 Testing Demo Mode (Mock Data)")
+    log("=" * 50)
     
     try:
+        from src.meteomatics_client import MeteomaticsClient
+        from src.weather_query_processor import WeatherQueryProcessor
+        
         # Create client with dummy credentials to test mock data
         client = MeteomaticsClient("demo", "demo")
         processor = WeatherQueryProcessor("demo", "demo")
@@ -110,50 +113,67 @@ def test_demo_mode():
             analysis_years=30
         )
         
-        print("✅ Demo mode test successful!")
-        print("   The application can run with mock data when API is unavailable")
+        log("✅ Demo mode test successful!")
+        log("   The application can run with mock data when API is unavailable")
         
         # Show sample results
         for param, result in results.get('parameters', {}).items():
             if 'error' not in result:
                 stats = result.get('basic_stats', {})
-                print(f"   {param}: Mean = {stats.get('mean', 'N/A'):.1f}")
+                log(f"   {param}: Mean = {stats.get('mean', 'N/A'):.1f}")
         
         return True
         
     except Exception as e:
-        print(f"❌ Demo mode test failed: {e}")
+        log(f"❌ Demo mode test failed: {e}")
         return False
 
 def main():
     """Run all tests."""
     
-    print("🔍 Meteomatics API Test Suite")
-    print("=" * 50)
+    parser = argparse.ArgumentParser(description="Validate the Meteomatics API setup")
+    parser.add_argument('--quiet', action='store_true',
+                        help='Only print the summary (e.g. in CI)')
+    args = parser.parse_args()
+    configure_logging('WARNING' if args.quiet else None)
     
-    # Test 1: API credentials and connection
-    api_success = test_api_credentials()
+    # Test 1 (API credentials and connection) and test 2 (demo mode) are
+    # independent, so run them concurrently; each buffers its report so the
+    # two don't interleave
+    api_report, demo_report = [], []
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        api_future = executor.submit(test_api_credentials, api_report.append)
+        demo_future = executor.submit(test_demo_mode, demo_report.append)
+        api_success = api_future.result()
+        demo_success = demo_future.result()
     
-    # Test 2: Demo mode
-    demo_success = test_demo_mode()
+    output = []
+    if not args.quiet:
+        output += ["🔍 Meteomatics API Test Suite", "=" * 50]
+        output += api_report + demo_report
     
     # Summary
-    print("\n📊 Test Summary")
-    print("=" * 30)
-    print(f"API Test: {'✅ PASS' if api_success else '❌ FAIL'}")
-    print(f"Demo Mode: {'✅ PASS' if demo_success else '❌ FAIL'}")
+    output += [
+        "\n📊 Test Summary",
+        "=" * 30,
+        f"API Test: {'✅ PASS' if api_success else '❌ FAIL'}",
+        f"Demo Mode: {'✅ PASS' if demo_success else '❌ FAIL'}",
+    ]
     
     if api_success:
-        print("\n🎉 Great! Your API credentials are working.")
-        print("   You can run the full application with real weather data.")
+        output.append("\n🎉 Great! Your API credentials are working.")
+        output.append("   You can run the full application with real weather data.")
     elif demo_success:
-        print("\n⚠️  API connection failed, but demo mode works.")
-        print("   You can still use the application with mock data for testing.")
+        output.append("\n⚠️  API connection failed, but demo mode works.")
+        output.append("   You can still use the application with mock data for testing.")
     else:
-        print("\n❌ Both tests failed. Please check your setup.")
+        output.append("\n❌ Both tests failed. Please check your setup.")
+    
+    output.append("\n🚀 To start the application, run:")
+    output.append("   streamlit run app.py")
     
-    print("\n🚀 To start the application, run:")
-    print("   streamlit run app.py")
+    # Written as one block
+    print("\n".join(output))
 
 if __name__ == "__main__":
     main()